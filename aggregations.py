@@ -0,0 +1,280 @@
+"""Aggregations behind the dashboard sections."""
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from partnerships import pair_totals, partnership_segments
+
+# Dismissals credited to the bowler (run outs, retirements etc. are not)
+BOWLER_WICKET_KINDS = ["bowled", "caught", "lbw", "stumped", "caught and bowled", "hit wicket"]
+
+
+# A metric is an additive per-ball value: `column` summed over the rows that
+# match `where` (count the balls when column is None). `where` maps a column
+# to a value, a list of values, or an inclusive (low, high) range where either
+# bound may be None.
+Metric = namedtuple("Metric", ["name", "column", "where"], defaults=[None, None])
+
+RUNS = Metric("runs", "batsman_runs")
+BALLS = Metric("balls")
+SIXES = Metric("sixes", where={"batsman_runs": 6})
+RUNS_CONCEDED = Metric("runs_conceded", "total_runs")
+WICKETS = Metric("wickets", where={"dismissal_kind": BOWLER_WICKET_KINDS})
+# Overs are 0-based: 15 and up are overs 16-20, as the powerplay's (0, 5) is overs 1-6
+DEATH_OVERS = (15, None)
+DEATH_WICKETS = Metric("death_wickets", "is_wicket", where={"over": DEATH_OVERS})
+DOTS = Metric("dots", where={"total_runs": 0})
+BOUNDARIES = Metric("boundaries", where={"batsman_runs": [4, 6]})
+
+
+def dismissals_by_kind(kinds):
+    return [Metric(kind.replace(" ", "_"), where={"dismissal_kind": kind}) for kind in kinds]
+
+
+def _condition_mask(values, condition):
+    if isinstance(condition, tuple):
+        low, high = condition
+        mask = np.ones(len(values), dtype=bool)
+        if low is not None:
+            mask &= values >= low
+        if high is not None:
+            mask &= values <= high
+        return np.asarray(mask)
+    if isinstance(condition, (list, set, frozenset)):
+        return np.asarray(values.isin(list(condition)))
+    return np.asarray(values == condition)
+
+
+def metric_columns(deliveries, metrics):
+    """Evaluate every metric on every ball, sharing identical filters."""
+    masks = {}
+    columns = {}
+    for metric in metrics:
+        values = (
+            np.ones(len(deliveries), dtype=np.int32) if metric.column is None
+            else deliveries[metric.column].to_numpy(dtype=np.int32)
+        )
+        for column, condition in (metric.where or {}).items():
+            key = (column, repr(condition))
+            if key not in masks:
+                masks[key] = _condition_mask(deliveries[column], condition)
+            values = np.where(masks[key], values, 0)
+        columns[metric.name] = values
+    return pd.DataFrame(columns, index=deliveries.index)
+
+
+def aggregate(deliveries, keys, metrics):
+    """All metrics per key in a single grouped sum.
+
+    keys maps an output name to the grouping column(s), e.g.
+    {"batter": "batter", "bowler_season": ["bowler", "season"]}, and one
+    compact frame is returned per entry. The per-ball metric columns are
+    built once and shared by every key.
+    """
+    values = metric_columns(deliveries, metrics)
+    results = {}
+    for name, columns in keys.items():
+        columns = [columns] if isinstance(columns, str) else list(columns)
+        grouped = values.groupby([deliveries[column] for column in columns], observed=True).sum()
+        results[name] = grouped.reset_index()
+    return results
+
+
+# Additive per-key tables the leaderboards and player summaries are derived
+# from. Every column that is not a key is summed, so the tables of two
+# disjoint sets of matches merge by concatenation plus a grouped sum.
+BASE_KEYS = {
+    "batter_season": ["batter", "season"],
+    "bowler_season": ["bowler", "season"],
+    "team_season": ["team", "season"],
+    "pairs": ["player_1", "player_2"],
+    "matchups": ["batter", "bowler"],
+    "player_of_match": ["player"],
+}
+
+
+def _as_str(frame, columns):
+    for column in columns:
+        frame[column] = frame[column].astype(str)
+    return frame
+
+
+def match_aggregates(matches):
+    """The base tables that need matches only (no deliveries)."""
+    # Team record per season, from both sides of every match
+    sides = pd.concat([
+        matches[["season", "team1", "winner"]].rename(columns={"team1": "team"}),
+        matches[["season", "team2", "winner"]].rename(columns={"team2": "team"}),
+    ])
+    sides["team"] = sides["team"].astype(str)
+    sides["wins"] = (sides["team"] == sides["winner"].astype(str)).astype(int)
+    team_season = sides.groupby(["team", "season"]).agg(
+        matches=pd.NamedAgg(column="wins", aggfunc="count"),
+        wins=pd.NamedAgg(column="wins", aggfunc="sum")
+    ).reset_index()
+
+    awards = matches["player_of_match"].astype(str).value_counts()
+    return {
+        "team_season": team_season,
+        "player_of_match": pd.DataFrame({"player": awards.index, "awards": awards.values}),
+    }
+
+
+def delivery_aggregates(deliveries):
+    """The base tables that need deliveries, for any set of whole matches."""
+    base = {}
+
+    per_key = aggregate(
+        deliveries,
+        {
+            "batter_season": ["batter", "season"],
+            "bowler_season": ["bowler", "season"],
+            "matchups": ["batter", "bowler"],
+        },
+        [RUNS, SIXES, BALLS, RUNS_CONCEDED, WICKETS, DEATH_WICKETS, DOTS, BOUNDARIES],
+    )
+
+    batting = per_key["batter_season"][["batter", "season", "runs", "balls", "sixes"]]
+    # Matches played is not a per-ball sum, but it stays additive across
+    # batches because a match is never split between two of them
+    batting["matches"] = (
+        deliveries.groupby(["batter", "season"], observed=True)["match_id"].nunique().to_numpy()
+    )
+    base["batter_season"] = batting
+    base["bowler_season"] = per_key["bowler_season"][
+        ["bowler", "season", "balls", "runs_conceded", "wickets", "death_wickets"]
+    ]
+    # Head to head; every wicket credited to the bowler is the striker's
+    matchups = per_key["matchups"][["batter", "bowler", "runs", "balls", "wickets", "dots", "boundaries"]]
+    base["matchups"] = matchups.rename(columns={"wickets": "dismissals"})
+
+    # Partnerships never span two matches, so per-pair totals stay additive
+    base["pairs"] = pair_totals(partnership_segments(deliveries))
+    return _string_keys(base)
+
+
+def _string_keys(base):
+    for name, frame in base.items():
+        _as_str(frame, [key for key in BASE_KEYS[name] if key != "season"])
+        base[name] = frame.reset_index(drop=True)
+    return base
+
+
+def compute_base_aggregates(matches, deliveries):
+    base = delivery_aggregates(deliveries)
+    base.update(_string_keys(match_aggregates(matches)))
+    return base
+
+
+def merge_base_aggregates(*parts):
+    """Combine base tables (all of them, or the same subset) of disjoint sets of matches."""
+    merged = {}
+    for name in parts[0]:
+        combined = pd.concat([part[name] for part in parts], ignore_index=True)
+        merged[name] = combined.groupby(BASE_KEYS[name], sort=True).sum().reset_index()
+    return merged
+
+
+def _top(frame, column, n=10, ascending=False):
+    return frame.sort_values(by=column, ascending=ascending).head(n).reset_index(drop=True)
+
+
+def match_leaderboards(aggregates, n=10):
+    """The leaderboards that need matches only, from match_aggregates() or the base."""
+    team_wins = aggregates["team_season"].groupby("team")["wins"].sum().reset_index()
+    return {
+        "team_wins": _top(team_wins[team_wins["wins"] > 0], "wins", n=None),
+        "impactful_players": _top(aggregates["player_of_match"], "awards", n),
+    }
+
+
+def leaderboards_from_base(base, n=10):
+    """Every leaderboard shown on the dashboard, as small string-keyed frames."""
+    leaderboards = match_leaderboards(base, n)
+
+    batters = base["batter_season"].groupby("batter")[["runs", "sixes"]].sum().reset_index()
+    top_batsmen = batters[["batter", "runs"]].rename(columns={"runs": "batsman_runs"})
+    leaderboards["top_batsmen"] = _top(top_batsmen, "batsman_runs", n)
+    leaderboards["most_sixes"] = _top(batters.loc[batters["sixes"] > 0, ["batter", "sixes"]], "sixes", n)
+
+    leaderboards["top_partnerships"] = _top(base["pairs"], "runs", n)
+
+    bowlers = base["bowler_season"].groupby("bowler").sum().reset_index()
+    leaderboards["top_bowlers"] = _top(bowlers.loc[bowlers["wickets"] > 0, ["bowler", "wickets"]], "wickets", n)
+
+    bowler_stats = bowlers[["bowler", "runs_conceded", "balls"]].rename(
+        columns={"runs_conceded": "total_runs", "balls": "total_balls"}
+    )
+    bowler_stats["economy"] = (bowler_stats["total_runs"] / (bowler_stats["total_balls"] / 6)).round(2)
+    qualified_bowlers = bowler_stats[bowler_stats["total_balls"] >= 300]  # 50 overs = 300 balls
+    leaderboards["top_economy_bowlers"] = _top(qualified_bowlers, "economy", n, ascending=True)
+
+    death_bowlers = bowlers.loc[bowlers["death_wickets"] > 0, ["bowler", "death_wickets"]]
+    leaderboards["death_bowlers"] = _top(death_bowlers.rename(columns={"death_wickets": "wickets"}), "wickets", n)
+
+    return leaderboards
+
+
+def compute_leaderboards(matches, deliveries, n=10):
+    return leaderboards_from_base(compute_base_aggregates(matches, deliveries), n)
+
+
+def _row_ranges(keys):
+    # keys must be sorted; maps each key to the (start, stop) rows it occupies
+    names, starts, counts = np.unique(keys.astype(str).to_numpy(), return_index=True, return_counts=True)
+    return {name: (start, start + count) for name, start, count in zip(names, starts, counts)}
+
+
+class PlayerIndex:
+    """Per-season batting and bowling summaries for every player, built once.
+
+    The summaries are sorted by player so each player's rows are contiguous
+    and a lookup is a dict access plus a slice, instead of a boolean scan of
+    every delivery followed by a groupby.
+    """
+
+    def __init__(self, base):
+        batting = base["batter_season"].rename(columns={"runs": "total_runs", "balls": "total_balls"})
+        batting = batting[["batter", "season", "total_runs", "total_balls", "matches"]]
+        batting["strike_rate"] = (batting["total_runs"] / batting["total_balls"] * 100).round(2)
+        self.batting = batting.sort_values(["batter", "season"], ignore_index=True)
+        self._batting_rows = _row_ranges(self.batting["batter"])
+        self._batting_table = self.batting.drop(columns="batter")
+
+        bowling = base["bowler_season"]
+        # A bowler without a single wicket still gets an (empty) bowling table
+        self.bowlers = set(bowling["bowler"])
+        bowling = bowling.loc[bowling["wickets"] > 0, ["bowler", "season", "wickets"]]
+        self.bowling = bowling.sort_values(["bowler", "season"], ignore_index=True)
+        self._bowling_rows = _row_ranges(self.bowling["bowler"])
+        self._bowling_table = self.bowling.drop(columns="bowler")
+
+        self.players = sorted(set(self._batting_rows) | self.bowlers)
+
+    def batting_summary(self, player):
+        """Batting by season, or None if the player never faced a ball."""
+        if player not in self._batting_rows:
+            return None
+        start, stop = self._batting_rows[player]
+        return self._batting_table.iloc[start:stop].reset_index(drop=True)
+
+    def bowling_summary(self, player):
+        """Wickets by season, or None if the player never bowled."""
+        if player not in self.bowlers:
+            return None
+        start, stop = self._bowling_rows.get(player, (0, 0))
+        return self._bowling_table.iloc[start:stop].reset_index(drop=True)
+
+
+if __name__ == "__main__":
+    from data_store import load_aggregates
+    from parallel import parallel_base_aggregates
+    from player_search import name_table_from_base
+
+    # Precompute stage: materialize the aggregates for the current dataset version
+    # (across $IPL_AGGREGATION_WORKERS processes when set)
+    base = load_aggregates("base", parallel_base_aggregates, from_store=True)
+    leaderboards = load_aggregates("leaderboards", lambda _store_dir: leaderboards_from_base(base), from_store=True)
+    load_aggregates("player_names", lambda _store_dir: name_table_from_base(base), from_store=True)
+    print(f"Materialized {len(base)} base tables and {len(leaderboards)} leaderboards.")
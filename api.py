@@ -0,0 +1,198 @@
+"""JSON API serving the dashboard's stats without Streamlit.
+
+    python api.py --port 8080
+
+Every response body is built once per dataset version, when the service
+starts or notices a new version, from the same store, aggregates and
+shared-memory cache as the dashboard. Requests are then a dict lookup on
+the path. Responses carry the dataset version as their ETag, so clients
+revalidating with If-None-Match get an empty 304 until new matches are
+ingested.
+
+    GET /health
+    GET /players/<player>
+    GET /squads/<team>/<season>
+    GET /leaderboards
+    GET /leaderboards/<name>
+"""
+import argparse
+import asyncio
+import json
+import time
+from urllib.parse import unquote, urlsplit
+
+from aggregations import PlayerIndex, leaderboards_from_base
+from data_store import STORE_DIR, Dataset, dataset_version, load_aggregates, read_manifest
+from parallel import parallel_base_aggregates
+from shared_cache import SharedCache
+from teams import load_teams, played_in, season_ranges, squad
+
+
+SQUAD_COLUMNS = ["batting_team", "bowling_team", "batter", "bowler"]
+REASONS = {200: "OK", 304: "Not Modified", 404: "Not Found", 405: "Method Not Allowed"}
+
+
+def _json(payload):
+    return json.dumps(payload, separators=(",", ":"), default=lambda value: value.item()).encode()
+
+
+def _records(frame):
+    return frame.to_dict(orient="records")
+
+
+def build_responses(store_dir=STORE_DIR, cache=None):
+    """(version, {decoded path: JSON body}) for every resource of the current dataset."""
+    version = dataset_version(store_dir=store_dir)
+    cache = cache or SharedCache()
+    dataset = Dataset(store_dir)
+
+    base = cache.get_frames(
+        version, "base", lambda: load_aggregates("base", parallel_base_aggregates, store_dir=store_dir, from_store=True)
+    )
+    leaderboards = cache.get_frames(
+        version, "leaderboards",
+        lambda: load_aggregates(
+            "leaderboards", lambda _store_dir: leaderboards_from_base(base), store_dir=store_dir, from_store=True
+        ),
+    )
+    matches = cache.get_frames(version, "matches", lambda: {"matches": dataset.matches()})["matches"]
+
+    responses = {"/health": _json({"status": "ok", "version": version})}
+
+    player_index = PlayerIndex(base)
+    for player in player_index.players:
+        batting = player_index.batting_summary(player)
+        bowling = player_index.bowling_summary(player)
+        responses[f"/players/{player}"] = _json({
+            "player": player,
+            "batting": None if batting is None else _records(batting),
+            "bowling": None if bowling is None else _records(bowling),
+        })
+
+    # Same rule as the dashboard: a squad is everyone who batted or bowled
+    # for the team that season
+    team_seasons = season_ranges(load_teams())
+    for season in dataset.seasons:
+        season_matches = matches[matches["season"] == season]
+        teams = sorted(set(season_matches["team1"].astype(str)) | set(season_matches["team2"].astype(str)))
+        deliveries = dataset.deliveries(seasons=[season], columns=SQUAD_COLUMNS)
+        for team in teams:
+            if played_in(team_seasons, team, season):
+                responses[f"/squads/{team}/{season}"] = _json({
+                    "team": team, "season": season, "players": squad(deliveries, team),
+                })
+
+    responses["/leaderboards"] = _json(sorted(leaderboards))
+    for name, frame in leaderboards.items():
+        responses[f"/leaderboards/{name}"] = _json(_records(frame))
+
+    return version, responses
+
+
+def _etag_matches(header, etag):
+    tags = [tag.strip() for tag in header.split(",")]
+    return "*" in tags or etag in tags or "W/" + etag in tags
+
+
+class StatsServer:
+    """Minimal HTTP/1.1 (keep-alive, GET only) over precomputed responses."""
+
+    def __init__(self, store_dir=STORE_DIR, reload_interval=5.0):
+        self.store_dir = store_dir
+        self.reload_interval = reload_interval
+        self.version, self.responses = build_responses(store_dir)
+
+    @property
+    def etag(self):
+        return f'"{self.version}"'
+
+    def respond(self, method, target, headers):
+        """(status, body, etag) for one request."""
+        if method not in ("GET", "HEAD"):
+            return 405, _json({"error": "only GET is supported"}), None
+
+        # Responses are keyed by the decoded path, e.g. "/players/V Kohli"
+        body = self.responses.get(unquote(urlsplit(target).path).rstrip("/"))
+        if body is None:
+            return 404, _json({"error": "not found"}), None
+
+        etag = self.etag
+        if _etag_matches(headers.get("if-none-match", ""), etag):
+            return 304, b"", etag
+        return 200, body, etag
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, target, http_version = request_line.decode("latin-1").split()
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                status, body, etag = self.respond(method, target, headers)
+                keep_alive = http_version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+
+                head = [
+                    f"HTTP/1.1 {status} {REASONS[status]}",
+                    "Content-Type: application/json",
+                    f"Content-Length: {len(body)}",
+                    # Clients may cache, but must revalidate against the version
+                    "Cache-Control: no-cache",
+                ]
+                if etag:
+                    head.append(f"ETag: {etag}")
+                if not keep_alive:
+                    head.append("Connection: close")
+                writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1"))
+                if method != "HEAD":
+                    writer.write(body)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def watch_version(self):
+        # Ingest moves the manifest on; rebuild the responses off the loop and swap
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(self.reload_interval)
+            manifest = read_manifest(self.store_dir)
+            if manifest is not None and manifest["version"] != self.version:
+                self.version, self.responses = await loop.run_in_executor(None, build_responses, self.store_dir)
+
+    async def serve(self, host="127.0.0.1", port=8080, ready=None):
+        server = await asyncio.start_server(self.handle, host, port)
+        watcher = asyncio.create_task(self.watch_version())
+        if ready is not None:
+            ready(server.sockets[0].getsockname()[1])
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            watcher.cancel()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve IPL stats as JSON.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--store-dir", default=STORE_DIR)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    stats_server = StatsServer(args.store_dir)
+    print(
+        f"Precomputed {len(stats_server.responses):,} responses for version {stats_server.version} "
+        f"in {time.perf_counter() - start:.1f}s; listening on http://{args.host}:{args.port}"
+    )
+    asyncio.run(stats_server.serve(args.host, args.port))
@@ -1,7 +1,22 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
 import streamlit as st
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
+
+from aggregations import PlayerIndex, leaderboards_from_base, match_aggregates, match_leaderboards
+from chart_cache import FigureCache
+from charts import (
+    plot_team_wins, plot_top_batsmen, plot_top_bowlers, plot_top_economy_bowlers, plot_top_partnerships,
+)
+from cube import roll_up, store_cube, with_rates
+from data_store import Dataset, dataset_version, load_aggregates
+from instrumentation import RerunTimer, count_cache_call, instrumentation_enabled, prometheus_text, span_table
+from matchups import MatchupMatrix
+from parallel import parallel_base_aggregates
+from player_search import NameIndex, name_table, name_table_from_base
+from shared_cache import SharedCache
+from sql_store import BACKEND_ENV, open_sql_backend
+from teams import load_teams, played_in, season_ranges, squad
 
 
 # Hide Streamlit's default menu and GitHub link
@@ -17,295 +32,422 @@ st.markdown(
 )
 
 
-@st.cache_data
-def load_data():
-    matches = pd.read_csv("matches_cleaned.csv")  
-    deliveries = pd.read_csv("deliveries_cleaned.csv")  
-    
-        
-    # Convert season column
-    matches["season"] = matches["season"].astype(str).str.extract(r'(\d{2,4})$')[0]
-    
-    # Convert to integer
-    matches["season"] = matches["season"].astype(int)
-    
-    # Convert 2-digit years to 4-digit
-    matches["season"] = matches["season"].apply(lambda x: x + 2000 if x < 100 else x)
+# The dashboard queries run against the columnar store by default, or
+# against the embedded SQLite database with IPL_BACKEND=sqlite
+USE_SQL = os.environ.get(BACKEND_ENV) == "sqlite"
+
+
+# Every cached loader takes the dataset version, so ingesting new matches
+# invalidates them on the next rerun. Frames come from the host-wide shared
+# cache and are held with cache_resource, so sessions share one read-only
+# copy instead of unpickling their own.
+@st.cache_resource
+def load_shared_cache():
+    count_cache_call("load_shared_cache", miss=True)
+    return SharedCache()
 
-    
 
-    deliveries = deliveries.merge(matches[["id", "season"]], left_on="match_id", right_on="id", how="left")
+@st.cache_resource(max_entries=2)
+def load_dataset(version):
+    count_cache_call("load_dataset", miss=True)
+    # Lazy handle on the season-partitioned store; deliveries are only read
+    # for the seasons/teams a section asks for
+    load_shared_cache().invalidate(keep=version)
+    return Dataset()
 
-    return matches, deliveries
 
-matches, deliveries = load_data()
+@st.cache_resource(max_entries=2)
+def load_data(version):
+    count_cache_call("load_data", miss=True)
+    # From the columnar store on either backend, so the first paint never
+    # waits for the SQLite database to be built
+    frames = load_shared_cache().get_frames(version, "matches", lambda: {"matches": load_dataset(version).matches()})
+    return frames["matches"]
 
+
+@st.cache_resource
+def load_figure_cache():
+    count_cache_call("load_figure_cache", miss=True)
+    # Rendered chart images, shared by every session of this process
+    return FigureCache()
+
+
+@st.cache_data
+def load_team_seasons():
+    count_cache_call("load_team_seasons", miss=True)
+    # Active seasons per team, from the team dimension table
+    return season_ranges(load_teams())
+
+
+@st.cache_resource
+def load_executor():
+    return ThreadPoolExecutor(max_workers=1, thread_name_prefix="ipl-load")
+
+
+def build_deliveries_views(shared_cache, version, use_sql=False):
+    # Everything derived from deliveries; runs on the loader thread.
+    # The venue cube comes from the columnar store on either backend.
+    cube = shared_cache.get_frames(version, "cube", lambda: load_aggregates("cube", store_cube, from_store=True))
+    if use_sql:
+        # Built from the store on the first load of a version
+        sql_backend = open_sql_backend()
+        # Player summaries are queried per selection, so only matchups are materialized
+        return {
+            "sql_backend": sql_backend,
+            "player_index": sql_backend,
+            "player_search": NameIndex(name_table(sql_backend.player_balls())),
+            "matchups": MatchupMatrix(sql_backend.matchups()),
+            "leaderboards": sql_backend.leaderboards(),
+            "cube": cube,
+        }
+
+    base = shared_cache.get_frames(
+        version, "base", lambda: load_aggregates("base", parallel_base_aggregates, from_store=True)
+    )
+    # Derived from base alone: from_store keeps a cold load from reading every delivery
+    leaderboards = shared_cache.get_frames(version, "leaderboards", lambda: load_aggregates(
+        "leaderboards", lambda _store_dir: leaderboards_from_base(base), from_store=True
+    ))
+    names = shared_cache.get_frames(version, "player_names", lambda: load_aggregates(
+        "player_names", lambda _store_dir: name_table_from_base(base), from_store=True
+    ))
+    return {
+        "sql_backend": None,
+        "player_index": PlayerIndex(base),
+        "player_search": NameIndex.from_tables(names),
+        "matchups": MatchupMatrix(base["matchups"]),
+        "leaderboards": leaderboards,
+        "cube": cube,
+    }
+
+
+@st.cache_resource(max_entries=2)
+def load_deliveries_views(version):
+    count_cache_call("load_deliveries_views", miss=True)
+    # A future, started on first use and shared by every session: the
+    # script renders what matches alone can answer, and only waits for it
+    # at the first section that needs deliveries
+    return load_executor().submit(build_deliveries_views, load_shared_cache(), version, USE_SQL)
+
+
+def ready_sql_backend(version):
+    # The SQLite backend once the background load has opened it, else None
+    if not USE_SQL:
+        return None
+    future = load_deliveries_views(version)
+    if not future.done() or future.exception() is not None:
+        return None
+    return future.result()["sql_backend"]
+
+
+@st.cache_data(max_entries=256)
+def load_venue_slice(version, venue, season):
+    count_cache_call("load_venue_slice", miss=True)
+    # Roll-ups of one venue (and season, or all of them) by phase and by team
+    cube = load_deliveries_views(version).result()["cube"]
+    filters = {"venue": venue, "season": season}
+    return (
+        with_rates(roll_up(cube["cube_innings"], ["phase"], **filters)),
+        with_rates(roll_up(cube["cube_matches"], ["team"], **filters)),
+    )
+
+
+@st.cache_data(max_entries=256)
+def load_squad(version, team, year):
+    count_cache_call("load_squad", miss=True)
+    # Until the background load has opened the SQLite backend, the partition read answers
+    sql_backend = ready_sql_backend(version)
+    if sql_backend is not None:
+        return sql_backend.squad(team, year)
+    # Season and team are pushed down, so only that season's partition is read
+    team_deliveries = load_dataset(version).deliveries(
+        seasons=[year], teams=[team], columns=["batting_team", "bowling_team", "batter", "bowler"]
+    )
+    return squad(team_deliveries, team)
+
+
+@st.cache_resource(max_entries=2)
+def load_match_leaderboards(version):
+    count_cache_call("load_match_leaderboards", miss=True)
+    return match_leaderboards(match_aggregates(load_data(version)))
+
+# Admin instrumentation, off unless IPL_INSTRUMENTATION=1 or the page is opened with ?admin=$IPL_ADMIN_TOKEN
+timer = RerunTimer(instrumentation_enabled(st.query_params.get("admin")))
+
+
+def cached(loader, *args):
+    count_cache_call(loader.__name__)
+    with timer.span(loader.__name__):
+        return loader(*args)
+
+
+def deliveries_views():
+    future = cached(load_deliveries_views, version)
+    try:
+        with timer.span("wait_deliveries_future"):
+            if not future.done():
+                with st.spinner("Loading ball-by-ball data..."):
+                    future.result()
+        return future.result()
+    except Exception:
+        # Don't keep a failed load cached for the rest of this version
+        load_deliveries_views.clear()
+        raise
+
+
+with timer.span("dataset_version"):
+    version = dataset_version()
+dataset = cached(load_dataset, version)
+matches = cached(load_data, version)
+load_deliveries_views(version)  # start loading deliveries-backed views in the background
+match_boards = cached(load_match_leaderboards, version)
+team_seasons = cached(load_team_seasons)
+figures = cached(load_figure_cache)
+
+timer.section("title")
 st.title("🏏 IPL Data Analysis Dashboard")
-# 🎛️ Interactive Player Search (Case-Insensitive + Runs + Wickets)
-# st.subheader("🔎 Search Player Stats")
-
-# Get unique player names
-unique_players = sorted(set(deliveries["batter"].dropna()).union(set(deliveries["bowler"].dropna())))
-
-# # Text input for player search
-# search_input = st.text_input("Enter player name:").strip().lower()
-
-# Auto-suggestion: Filter player names
-# suggested_players = [name for name in unique_players if search_input in name.lower()] if search_input else unique_players
-
-# Selectbox for player selection with filtered suggestions
-# selected_player = st.selectbox("Select Player:", suggested_players, index=0 if suggested_players else None)
-st.subheader("🔎 Search Player Stats")
-
-# Get unique player names
-# unique_players = sorted(set(deliveries["batter"].dropna()).union(set(deliveries["bowler"].dropna())))
-
-# Selectbox for player selection with auto-suggestions
-selected_player = st.selectbox("Select Player:", unique_players)
-
-
-if selected_player:
-    st.write(f"### 🏏 {selected_player}'s Performance")
-
-    # Filter player data
-    player_stats = deliveries[deliveries["batter"] == selected_player]
-    bowler_stats = deliveries[deliveries["bowler"] == selected_player]
-
-    if not player_stats.empty:
-        batting_summary = player_stats.groupby("season").agg(
-            total_runs=pd.NamedAgg(column="batsman_runs", aggfunc="sum"),
-            total_balls=pd.NamedAgg(column="ball", aggfunc="count"),
-            matches=pd.NamedAgg(column="match_id", aggfunc="nunique")
-        ).reset_index()
-        batting_summary["strike_rate"] = (batting_summary["total_runs"] / batting_summary["total_balls"] * 100).round(2)
-
-        st.write("### 🏏 Batting Performance by Year")
-        st.write(batting_summary)
-
-    if not bowler_stats.empty:
-        wicket_deliveries = bowler_stats[
-            bowler_stats["dismissal_kind"].isin(["bowled", "caught", "lbw", "stumped", "caught and bowled", "hit wicket"])
-        ]
-        bowling_summary = wicket_deliveries.groupby("season")["player_dismissed"].count().reset_index()
-        bowling_summary.rename(columns={"player_dismissed": "wickets"}, inplace=True)
-
-        st.write("### 🎯 Bowling Performance by Year")
-        st.write(bowling_summary)
-
-    if player_stats.empty and bowler_stats.empty:
-        st.write("⚠️ No data available for this player!")
-st.subheader("🏏 Search Team Squad by Year")
-
-min_year = 2008
-max_year = matches["season"].max()
-
-year = st.number_input("Enter Year:", min_value=min_year, max_value=max_year, step=1)
-
-# Team Name Mapping
-team_name_mapping = {
-    "Delhi Daredevils": "Delhi Capitals (2008-Present)",
-    "Delhi Capitals": "Delhi Capitals (2008-Present)",
-    "Royal Challengers Bangalore": "Royal Challengers Bengaluru",
-    "Deccan Chargers": "Deccan Chargers (2008-2012)",
-    "Kings XI Punjab": "Kings XI Punjab (2008-2020)",
-    "Punjab Kings": "Punjab Kings (2021-Present)",
-    "Kochi Tuskers Kerala": "Kochi Tuskers Kerala (2011)",
-    "Pune Warriors": "Pune Warriors India (2011-2013)",
-    "Gujarat Lions": "Gujarat Lions (2016-2017)",
-    # "Rising Pune Supergiants": "Rising Pune Supergiant (2016-2017)"
-     "Rising Pune Supergiants": "Rising Pune Supergiants (2016-2017)",
-    "Rising Pune Supergiant": "Rising Pune Supergiants (2016-2017)", 
-
-    "Chennai Super Kings": "Chennai Super Kings",
-    "Rajasthan Royals": "Rajasthan Royals"
-}
-
-matches["team1"] = matches["team1"].replace(team_name_mapping)
-matches["team2"] = matches["team2"].replace(team_name_mapping)
-deliveries["batting_team"] = deliveries["batting_team"].replace(team_name_mapping)
-deliveries["bowling_team"] = deliveries["bowling_team"].replace(team_name_mapping)
-
-teams = sorted(set(matches["team1"]).union(set(matches["team2"])))
-
-team = st.selectbox("Select Team:", teams)
-
-special_cases = {
-    "Chennai Super Kings": list(range(2008, 2016)) + list(range(2018, max_year + 1)),
-    "Rajasthan Royals": list(range(2008, 2016)) + list(range(2018, max_year + 1)),
-    "Deccan Chargers (2008-2012)": list(range(2008, 2013)),
-    "Kings XI Punjab (2008-2020)": list(range(2008, 2021)),
-    "Punjab Kings (2021-Present)": list(range(2021, max_year + 1)),
-    "Delhi Capitals (2008-Present)": list(range(2008, max_year + 1)),  
-    "Rising Pune Supergiant (2016-2017)": [2016, 2017],
-    "Pune Warriors India (2011-2013)": list(range(2011, 2014)),
-}
-
-
-if team and year:
-    if team in special_cases and year not in special_cases[team]:
-        st.write(f"⚠️ {team} did not play in IPL {year}.")
-    else:
-        team_matches = matches[(matches["season"] == year) & ((matches["team1"] == team) | (matches["team2"] == team))]
-
-        if not team_matches.empty:
-            team_deliveries = deliveries[deliveries["match_id"].isin(team_matches["id"])]
-
-            team_batters = team_deliveries[team_deliveries["batting_team"] == team]["batter"].dropna().unique()
-            team_bowlers = team_deliveries[team_deliveries["bowling_team"] == team]["bowler"].dropna().unique()
-
-            unique_players = sorted(set(team_batters).union(set(team_bowlers)))
-
-            if unique_players:
-                st.write(f"### 🏏 {team} Squad in {year}")
-                st.write(", ".join(unique_players))
-            else:
-                st.write(f"⚠️ No squad data available for {team} in {year}!")
-        else:
-            st.write(f"⚠️ No matches found for {team} in {year}.")
 
+# The page is laid out up front and filled as its data becomes available:
+# matches-only sections first, deliveries-backed ones once loaded
+player_section = st.container()
+squad_section = st.container()
+matchup_section = st.container()
+teams_section = st.container()
+venue_section = st.container()
+batting_section = st.container()
+bowling_section = st.container()
+awards_section = st.container()
+with awards_section:
+    awards_tab1, awards_tab2 = st.tabs([
+         "Most Impactful Players", "Most Sixes"
+    ])
+
+
+timer.section("team_wins")
+with teams_section:
+    st.subheader("🏆 Most Successful IPL Teams")
+    team_wins = match_boards["team_wins"].set_index("team")["wins"]
+    st.image(figures.get_or_render(version, "team_wins", lambda: plot_team_wins(team_wins)), width="stretch")
+
+
+timer.section("impactful_players")
+with awards_tab1:
+    st.subheader("🏆 Most Impactful Players (By Player of the Match Awards)")
+    impactful_players = match_boards["impactful_players"].set_index("player")["awards"]
+    st.bar_chart(impactful_players)
 
 
-st.subheader("🏆 Most Successful IPL Teams")
-team_wins = matches[matches["winner"] != "No Result"]["winner"].value_counts()
+timer.section("squad")
+with squad_section:
+    st.subheader("🏏 Search Team Squad by Year")
 
-fig, ax = plt.subplots(figsize=(10, 5))
-sns.barplot(y=team_wins.index, x=team_wins.values, palette="viridis", ax=ax)
-ax.set_xlabel("Total Wins")
-ax.set_ylabel("Teams")
-ax.set_title("Most Successful IPL Teams")
+    min_year = 2008
+    max_year = int(matches["season"].max())
 
+    year = st.number_input("Enter Year:", min_value=min_year, max_value=max_year, step=1)
 
-for index, value in enumerate(team_wins.values):
-    ax.text(value + 2, index, str(value), va='center', fontsize=12)
+    teams = sorted(set(matches["team1"]).union(set(matches["team2"])))
 
-st.pyplot(fig)
+    team = st.selectbox("Select Team:", teams)
 
+    if team and year:
+        if not played_in(team_seasons, team, year):
+            st.write(f"⚠️ {team} did not play in IPL {year}.")
+        else:
+            team_matches = matches[(matches["season"] == year) & ((matches["team1"] == team) | (matches["team2"] == team))]
 
+            if not team_matches.empty:
+                unique_players = cached(load_squad, version, team, int(year))
+                timer.add_rows(len(unique_players))
 
-tab1, tab2 = st.tabs(["Top 10 Batsmen (By Runs)", "Highest Partnerships (By Runs)"])
+                if unique_players:
+                    st.write(f"### 🏏 {team} Squad in {year}")
+                    st.write(", ".join(unique_players))
+                else:
+                    st.write(f"⚠️ No squad data available for {team} in {year}!")
+            else:
+                st.write(f"⚠️ No matches found for {team} in {year}.")
 
 
-with tab1:
-    st.subheader("🏏 Top 10 IPL Batsmen by Runs")
-    
-    batsman_runs = deliveries.groupby("batter")["batsman_runs"].sum().reset_index()
-    top_batsmen = batsman_runs.sort_values(by="batsman_runs", ascending=False).head(10)
+timer.section("wait_deliveries")
+with player_section:
+    views = deliveries_views()
+player_index = views["player_index"]
+player_search = views["player_search"]
+matchups = views["matchups"]
+leaderboards = views["leaderboards"]
+cube = views["cube"]
 
-    fig, ax = plt.subplots(figsize=(10, 5))
-    sns.barplot(y=top_batsmen["batter"], x=top_batsmen["batsman_runs"], palette="coolwarm", ax=ax)
-    ax.set_xlabel("Total Runs")
-    ax.set_ylabel("Batsmen")
-    ax.set_title("Top 10 IPL Batsmen by Runs")
 
-    # Add labels
-    for index, value in enumerate(top_batsmen["batsman_runs"]):
-        ax.text(value + 200, index, str(value), va='center', fontsize=12)
+timer.section("player_search")
+with player_section:
+    # 🎛️ Interactive Player Search (Case-Insensitive + Runs + Wickets)
+    st.subheader("🔎 Search Player Stats")
 
-    st.pyplot(fig)
+    # Text input for player search; it only reruns the script on Enter or
+    # when it loses focus, not per keystroke
+    search_input = st.text_input("Search player:", placeholder="Any part of a name, e.g. kohli")
 
+    # Auto-suggestion from the name index: only the best matches (or the
+    # most-played players, before anything is typed) reach the browser
+    suggested_players = player_search.search(search_input)
+    if not suggested_players:
+        st.write(f"⚠️ No player matches \"{search_input}\".")
 
-with tab2:
-    st.subheader("🤝 Highest IPL Partnerships by Runs")
+    # Selectbox for player selection with filtered suggestions
+    selected_player = st.selectbox("Select Player:", suggested_players, index=0 if suggested_players else None)
 
-    partnerships = deliveries.groupby(["match_id", "batter", "non_striker"])["batsman_runs"].sum().reset_index()
-    partnerships = partnerships.groupby(["batter", "non_striker"])["batsman_runs"].sum().reset_index()
-    top_partnerships = partnerships.sort_values(by="batsman_runs", ascending=False).head(10)
+    if selected_player:
+        st.write(f"### 🏏 {selected_player}'s Performance")
 
-    fig, ax = plt.subplots(figsize=(10, 5))
-    sns.barplot(y=top_partnerships["batsman_runs"], 
-                x=top_partnerships["batter"] + " & " + top_partnerships["non_striker"], 
-                palette="magma", ax=ax)
-    ax.set_ylabel("Total Runs")
-    ax.set_xlabel("Partnerships")
-    ax.set_title("Top 10 Highest IPL Partnerships by Runs")
-    plt.xticks(rotation=45, ha='right')
+        # Precomputed per-season summaries; None when the player never batted/bowled
+        batting_summary = player_index.batting_summary(selected_player)
+        bowling_summary = player_index.bowling_summary(selected_player)
 
-    for index, value in enumerate(top_partnerships["batsman_runs"]):
-        ax.text(index, value + 5, str(value), ha='center', fontsize=12)
+        for summary in (batting_summary, bowling_summary):
+            if summary is not None:
+                timer.add_rows(len(summary))
 
-    st.pyplot(fig)
-    
+        if batting_summary is not None:
+            st.write("### 🏏 Batting Performance by Year")
+            st.write(batting_summary)
 
-tab1, tab2, tab3= st.tabs(["Top 10 Bowlers (By Wickets)", "Best Economy Bowlers (Min 50 Overs)",
-    "Death Bowlers"])
+        if bowling_summary is not None:
+            st.write("### 🎯 Bowling Performance by Year")
+            st.write(bowling_summary)
 
+        if batting_summary is None and bowling_summary is None:
+            st.write("⚠️ No data available for this player!")
 
-with tab1:
-    st.subheader("🎯 Top 10 IPL Bowlers by Wickets")
-    
-    wicket_deliveries = deliveries[
-        deliveries["dismissal_kind"].isin(["bowled", "caught", "lbw", "stumped", "caught and bowled", "hit wicket"])
-    ]
 
-    bowler_wickets = wicket_deliveries.groupby("bowler")["player_dismissed"].count().reset_index()
-    bowler_wickets.rename(columns={"player_dismissed": "wickets"}, inplace=True)
-    top_bowlers = bowler_wickets.sort_values(by="wickets", ascending=False).head(10)
+timer.section("matchups")
+with matchup_section:
+    st.subheader("⚔️ Batter vs Bowler")
 
-    fig, ax = plt.subplots(figsize=(10, 5))
-    sns.barplot(y=top_bowlers["bowler"], x=top_bowlers["wickets"], palette="magma", ax=ax)
-    ax.set_xlabel("Total Wickets")
-    ax.set_ylabel("Bowlers")
-    ax.set_title("Top 10 IPL Bowlers by Wickets")
+    matchup_batter = st.selectbox("Select Batter:", matchups.batters)
+    batter_matchups = matchups.batter_matchups(matchup_batter).sort_values("balls", ascending=False, ignore_index=True)
+    timer.add_rows(len(batter_matchups))
 
-    # Add labels
-    for index, value in enumerate(top_bowlers["wickets"]):
-        ax.text(value + 2, index, str(value), va='center', fontsize=12)
+    # Start on the bowler this batter has faced most
+    most_faced = matchups.bowlers.index(batter_matchups["bowler"].iloc[0])
+    matchup_bowler = st.selectbox("Select Bowler:", matchups.bowlers, index=most_faced)
 
-    st.pyplot(fig)
+    if matchup_batter and matchup_bowler:
+        matchup = matchups.lookup(matchup_batter, matchup_bowler)
+        if matchup is None:
+            st.write(f"⚠️ {matchup_batter} has never faced {matchup_bowler}.")
+        else:
+            strike_rate = round(matchup["runs"] / matchup["balls"] * 100, 2)
+            columns = st.columns(6)
+            columns[0].metric("Runs", matchup["runs"])
+            columns[1].metric("Balls", matchup["balls"])
+            columns[2].metric("Dismissals", matchup["dismissals"])
+            columns[3].metric("Dots", matchup["dots"])
+            columns[4].metric("Boundaries", matchup["boundaries"])
+            columns[5].metric("Strike Rate", strike_rate)
 
+        with st.expander(f"All bowlers faced by {matchup_batter}"):
+            st.write(batter_matchups)
 
-with tab2:
-    st.subheader("💰 Best Economy Rate Bowlers (Min 50 Overs)")
 
-    bowler_stats = deliveries.groupby("bowler").agg(
-        total_runs=pd.NamedAgg(column="total_runs", aggfunc="sum"),
-        total_balls=pd.NamedAgg(column="ball", aggfunc="count")
-    ).reset_index()
+timer.section("batting_tabs")
+with batting_section:
+    tab1, tab2 = st.tabs(["Top 10 Batsmen (By Runs)", "Highest Partnerships (By Runs)"])
 
-    bowler_stats["economy"] = (bowler_stats["total_runs"] / (bowler_stats["total_balls"] / 6)).round(2)
-    qualified_bowlers = bowler_stats[bowler_stats["total_balls"] >= 300]  # 50 overs = 300 balls
-    top_economy_bowlers = qualified_bowlers.sort_values(by="economy").head(10)
 
-    fig, ax = plt.subplots(figsize=(10, 5))
-    sns.barplot(y=top_economy_bowlers["bowler"], x=top_economy_bowlers["economy"], palette="coolwarm", ax=ax)
-    ax.set_xlabel("Economy Rate")
-    ax.set_ylabel("Bowlers")
-    ax.set_title("Best Economy Rate Bowlers (Min 50 Overs)")
+    with tab1:
+        st.subheader("🏏 Top 10 IPL Batsmen by Runs")
+    
+        top_batsmen = leaderboards["top_batsmen"]
+        st.image(figures.get_or_render(version, "top_batsmen", lambda: plot_top_batsmen(top_batsmen)), width="stretch")
 
-    # Add labels
-    for index, value in enumerate(top_economy_bowlers["economy"]):
-        ax.text(value + 0.1, index, str(value), va='center', fontsize=12)
 
-    st.pyplot(fig)
+    with tab2:
+        st.subheader("🤝 Highest IPL Partnerships by Runs")
 
-with tab3:
-    st.subheader("🎯 Most Effective Death Bowlers (Wickets in Overs 16-20)")
-    death_bowlers = deliveries[(deliveries["over"] >= 16) & (deliveries["is_wicket"] == 1)]
-    death_bowlers_count = death_bowlers["bowler"].value_counts().head(10)
-    st.bar_chart(death_bowlers_count)
+        top_partnerships = leaderboards["top_partnerships"]
+        st.image(
+            figures.get_or_render(version, "top_partnerships", lambda: plot_top_partnerships(top_partnerships)),
+            width="stretch",
+        )
+    
 
+timer.section("bowling_tabs")
+with bowling_section:
+    tab1, tab2, tab3= st.tabs(["Top 10 Bowlers (By Wickets)", "Best Economy Bowlers (Min 50 Overs)",
+        "Death Bowlers"])
 
-tab1, tab2 = st.tabs([
-     "Most Impactful Players", "Most Sixes"
-])
 
+    with tab1:
+        st.subheader("🎯 Top 10 IPL Bowlers by Wickets")
+    
+        top_bowlers = leaderboards["top_bowlers"]
+        st.image(figures.get_or_render(version, "top_bowlers", lambda: plot_top_bowlers(top_bowlers)), width="stretch")
+
+
+    with tab2:
+        st.subheader("💰 Best Economy Rate Bowlers (Min 50 Overs)")
+
+        top_economy_bowlers = leaderboards["top_economy_bowlers"]
+        st.image(
+            figures.get_or_render(version, "top_economy_bowlers", lambda: plot_top_economy_bowlers(top_economy_bowlers)),
+            width="stretch",
+        )
+
+    with tab3:
+        st.subheader("🎯 Most Effective Death Bowlers (Wickets in Overs 16-20)")
+        death_bowlers_count = leaderboards["death_bowlers"].set_index("bowler")["wickets"]
+        st.bar_chart(death_bowlers_count)
 
-with tab1:
-    st.subheader("🏆 Most Impactful Players (By Player of the Match Awards)")
-    impactful_players = matches["player_of_match"].value_counts().head(10)
-    st.bar_chart(impactful_players)
 
-with tab2:
+timer.section("most_sixes")
+with awards_tab2:
     st.subheader("💥 Most Six-Hitters in IPL History")
-    sixes = deliveries[deliveries["batsman_runs"] == 6]
-    most_sixes = sixes["batter"].value_counts().head(10)
+    most_sixes = leaderboards["most_sixes"].set_index("batter")["sixes"]
     st.bar_chart(most_sixes)
 
 
+timer.section("venues")
+with venue_section:
+    st.subheader("🏟️ Venue Insights")
+
+    # Busiest grounds first; every match has two sides in the cube
+    venue_matches = roll_up(cube["cube_matches"], ["venue"]).sort_values("matches", ascending=False, kind="stable")
+    columns = st.columns(2)
+    venue = columns[0].selectbox("Select Venue:", venue_matches["venue"].tolist())
+    venue_seasons = sorted(roll_up(cube["cube_matches"], ["season"], venue=venue)["season"].tolist(), reverse=True)
+    season = columns[1].selectbox("Select Season:", ["All seasons"] + venue_seasons)
+
+    phases, teams_at_venue = cached(load_venue_slice, version, venue, None if season == "All seasons" else season)
+    timer.add_rows(len(phases) + len(teams_at_venue))
+
+    totals = with_rates(roll_up(teams_at_venue, []))
+    innings_totals = with_rates(roll_up(phases, []))
+    columns = st.columns(4)
+    columns[0].metric("Matches", int(totals["matches"].iloc[0]) // 2)
+    columns[1].metric("Run Rate", innings_totals["run_rate"].iloc[0])
+    columns[2].metric("Toss Winner Won %", totals["toss_winner_won_pct"].iloc[0])
+    columns[3].metric("Chasing Won %", totals["chase_win_pct"].iloc[0])
+
+    st.write("### 📈 Scoring by Phase")
+    st.write(phases)
+    st.write("### 🏏 Teams at this Venue")
+    st.write(teams_at_venue.sort_values("matches", ascending=False, ignore_index=True))
 
 
 st.write("📊 More insights coming soon!")
 
 
 st.markdown("---")  # Adds a horizontal line
-st.write("👨‍💻 **Developed by: PJ Hemanadhan**")
\ No newline at end of file
+st.write("👨‍💻 **Developed by: PJ Hemanadhan**")
+
+shared_cache = load_shared_cache()
+cache_stats = {"figures": (figures.hits, figures.misses), "shared": (shared_cache.hits, shared_cache.misses)}
+timer.finish(cache_stats)
+if timer.enabled:
+    with st.sidebar:
+        st.header("⏱️ Admin")
+        st.metric("Rerun", f"{timer.seconds * 1e3:.0f} ms")
+        st.dataframe(span_table(timer), hide_index=True)
+        with st.expander("Prometheus metrics"):
+            st.code(prometheus_text(timer, cache_stats), language="text")
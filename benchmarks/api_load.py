@@ -0,0 +1,91 @@
+"""Local load test of the JSON API: throughput and latency percentiles.
+
+Run from the repository root:
+
+    python -m benchmarks.api_load
+
+Starts the API on a free local port in a background thread, then drives it
+from keep-alive client connections with a mix of player, squad and
+leaderboard requests, a share of them revalidating with If-None-Match.
+"""
+import asyncio
+import random
+import threading
+import time
+
+import numpy as np
+
+from api import StatsServer
+
+
+def start_server():
+    server = StatsServer()
+    started = threading.Event()
+    port = []
+
+    def ready(bound_port):
+        port.append(bound_port)
+        started.set()
+
+    thread = threading.Thread(target=lambda: asyncio.run(server.serve(port=0, ready=ready)), daemon=True)
+    thread.start()
+    started.wait()
+    return server, port[0]
+
+
+async def client(port, paths, etag, n_requests, revalidate, latencies, statuses, seed):
+    rng = random.Random(seed)
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    for _ in range(n_requests):
+        path = rng.choice(paths).replace(" ", "%20")
+        request = f"GET {path} HTTP/1.1\r\nHost: localhost\r\n"
+        if rng.random() < revalidate:
+            request += f"If-None-Match: {etag}\r\n"
+
+        start = time.perf_counter()
+        writer.write((request + "\r\n").encode())
+        status = int((await reader.readline()).split()[1])
+        length = 0
+        while True:
+            line = await reader.readline()
+            if line == b"\r\n":
+                break
+            name, _, value = line.decode().partition(":")
+            if name.lower() == "content-length":
+                length = int(value)
+        await reader.readexactly(length)
+        latencies.append(time.perf_counter() - start)
+        statuses[status] = statuses.get(status, 0) + 1
+    writer.close()
+
+
+async def load(port, paths, etag, connections, requests_per_connection, revalidate):
+    latencies, statuses = [], {}
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        client(port, paths, etag, requests_per_connection, revalidate, latencies, statuses, seed)
+        for seed in range(connections)
+    ))
+    return time.perf_counter() - start, np.array(latencies), statuses
+
+
+def main(connections=32, requests_per_connection=500, revalidate=0.3):
+    start = time.perf_counter()
+    server, port = start_server()
+    startup = time.perf_counter() - start
+
+    paths = [path for path in server.responses if path != "/health"]
+    elapsed, latencies, statuses = asyncio.run(
+        load(port, paths, server.etag, connections, requests_per_connection, revalidate)
+    )
+
+    print(f"precomputed responses: {len(server.responses):,} (startup {startup:.2f} s)")
+    print(f"connections:           {connections}")
+    print(f"requests:              {len(latencies):,} {dict(sorted(statuses.items()))}")
+    print(f"throughput:            {len(latencies) / elapsed:9.0f} req/s")
+    print(f"latency p50:           {np.percentile(latencies, 50) * 1e3:9.2f} ms")
+    print(f"latency p99:           {np.percentile(latencies, 99) * 1e3:9.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Cleaning pipeline: stage timings and byte-for-byte check against the cleaned files.
+
+Run from the repository root:
+
+    python -m benchmarks.cleaning
+    python -m benchmarks.cleaning --deliveries path/to/deliveries.csv
+
+Cleans the raw files into a temporary directory with cleaning.clean_files
+and compares the output with matches_cleaned.csv and deliveries_cleaned.csv.
+The raw matches.csv ships with the repository; the raw deliveries.csv does
+not. Without --deliveries, a raw-layout deliveries file is generated for
+the shipped matches (two full innings each, with placeholder players), so
+the stages are timed at the real size, and only matches_cleaned.csv is
+compared byte for byte.
+"""
+import argparse
+import filecmp
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from cleaning import clean_files
+from data_store import DELIVERIES_CSV, MATCHES_CSV
+
+RAW_DELIVERIES_COLUMNS = [
+    "match_id", "inning", "batting_team", "bowling_team", "over", "ball", "batter", "bowler", "non_striker",
+    "batsman_runs", "extra_runs", "total_runs", "extras_type", "is_wicket", "player_dismissed",
+    "dismissal_kind", "fielder",
+]
+SQUAD_SIZE = 11
+
+
+def generate_raw_deliveries(matches_csv, path, seed=0):
+    """Write a raw-layout deliveries.csv for every match in matches_csv: 2 innings of 20 overs."""
+    matches = pd.read_csv(matches_csv, usecols=["id", "team1", "team2"])
+    rng = np.random.default_rng(seed)
+    n = len(matches) * 2 * 120
+
+    match = np.repeat(np.arange(len(matches)), 240)
+    inning = np.tile(np.repeat([1, 2], 120), len(matches))
+    batting_first = inning == 1
+    team1 = matches["team1"].to_numpy(dtype=object)[match]
+    team2 = matches["team2"].to_numpy(dtype=object)[match]
+    batting_team = np.where(batting_first, team1, team2)
+    bowling_team = np.where(batting_first, team2, team1)
+
+    def player(team, role):
+        return pd.Series(team).str.cat(rng.integers(1, SQUAD_SIZE + 1, n).astype(str), sep=f" {role} ").to_numpy()
+
+    batsman_runs = rng.choice([0, 1, 2, 3, 4, 6], size=n, p=[0.38, 0.36, 0.07, 0.01, 0.12, 0.06])
+    extra_runs = np.where(rng.random(n) < 0.05, 1, 0)
+    is_wicket = (rng.random(n) < 0.05).astype(int)
+    batter = player(batting_team, "batter")
+    wicket = is_wicket == 1
+
+    raw = pd.DataFrame({
+        "match_id": matches["id"].to_numpy()[match],
+        "inning": inning,
+        "batting_team": batting_team,
+        "bowling_team": bowling_team,
+        "over": np.tile(np.repeat(np.arange(20), 6), 2 * len(matches)),
+        "ball": np.tile(np.arange(1, 7), 40 * len(matches)),
+        "batter": batter,
+        "bowler": player(bowling_team, "bowler"),
+        "non_striker": player(batting_team, "batter"),
+        "batsman_runs": batsman_runs,
+        "extra_runs": extra_runs,
+        "total_runs": batsman_runs + extra_runs,
+        "extras_type": np.where(extra_runs > 0, "wides", None),
+        "is_wicket": is_wicket,
+        "player_dismissed": np.where(wicket, batter, None),
+        "dismissal_kind": np.where(wicket, "caught", None),
+        "fielder": np.where(wicket, player(bowling_team, "fielder"), None),
+    }, columns=RAW_DELIVERIES_COLUMNS)
+    raw.to_csv(path, index=False)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the cleaning pipeline and check its output.")
+    parser.add_argument("--matches", default="matches.csv", help="raw matches CSV")
+    parser.add_argument("--deliveries", help="raw deliveries CSV (default: generated for the matches)")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix="ipl_clean_")
+    try:
+        deliveries_csv = args.deliveries
+        compared = [MATCHES_CSV, DELIVERIES_CSV]
+        if deliveries_csv is None:
+            deliveries_csv = generate_raw_deliveries(args.matches, os.path.join(work_dir, "deliveries.csv"))
+            compared = [MATCHES_CSV]
+            print(f"generated raw deliveries for {args.matches} (no --deliveries given)")
+
+        out_dir = os.path.join(work_dir, "out")
+        os.makedirs(out_dir)
+        runs = [clean_files(args.matches, deliveries_csv, out_dir) for _ in range(args.repeat)]
+        print(f"stage timings (best of {args.repeat})")
+        for stage in runs[0]:
+            print(f"  {stage:<18} {min(run[stage] for run in runs) * 1e3:9.1f} ms")
+        print(f"  {'total':<18} {min(sum(run.values()) for run in runs) * 1e3:9.1f} ms")
+
+        for name in compared:
+            same = filecmp.cmp(os.path.join(out_dir, name), name, shallow=False)
+            print(f"{name}: {'byte-identical' if same else 'DIFFERS'}")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
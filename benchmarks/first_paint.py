@@ -0,0 +1,95 @@
+"""Time to first paint of the dashboard, from a fresh worker process.
+
+Run from the repository root:
+
+    python -m benchmarks.first_paint
+
+Each run starts a new Python process that executes app.py once under
+Streamlit's AppTest with instrumentation on, in a scratch copy of the
+store, and reads back when every section finished (ipl_section_finished_
+seconds). Two cases are measured:
+
+    warm: aggregates materialized and the shared frame cache populated,
+          i.e. a new worker joining a running deployment
+    cold: no materialized aggregates, SQLite database or shared cache,
+          i.e. the first visitor after new matches were ingested
+
+Set IPL_BACKEND=sqlite to measure the dashboard on the SQLite backend.
+"""
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+
+from data_store import AGGREGATES_DIR, DELIVERIES_CSV, MATCHES_CSV, STORE_DIR, dataset_version
+from sql_store import SQL_DB
+from teams import TEAMS_CSV
+
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RUN_APP = (
+    "from streamlit.testing.v1 import AppTest\n"
+    f"at = AppTest.from_file({os.path.join(REPO, 'app.py')!r}, default_timeout=600).run()\n"
+    "assert not at.exception, [e.value for e in at.exception]\n"
+)
+
+
+def scratch_copy(work_dir, keep_aggregates):
+    for name in (MATCHES_CSV, DELIVERIES_CSV, TEAMS_CSV):
+        os.symlink(os.path.abspath(name), os.path.join(work_dir, name))
+    ignore = None if keep_aggregates else shutil.ignore_patterns(AGGREGATES_DIR, SQL_DB)
+    shutil.copytree(STORE_DIR, os.path.join(work_dir, STORE_DIR), ignore=ignore)
+
+
+def run_app(work_dir, shared_cache_dir):
+    metrics_file = os.path.join(work_dir, "metrics.prom")
+    env = dict(
+        os.environ,
+        PYTHONPATH=REPO,
+        IPL_INSTRUMENTATION="1",
+        IPL_METRICS_FILE=metrics_file,
+        IPL_SHARED_CACHE=shared_cache_dir,
+    )
+    subprocess.run([sys.executable, "-c", RUN_APP], cwd=work_dir, env=env, check=True, capture_output=True)
+
+    with open(metrics_file) as f:
+        text = f.read()
+    finished = {
+        section: float(seconds)
+        for section, seconds in re.findall(r'^ipl_section_finished_seconds\{section="([^"]+)"\} (\S+)$', text, re.M)
+    }
+    rerun = float(re.search(r"^ipl_rerun_seconds (\S+)$", text, re.M).group(1))
+    return finished, rerun
+
+
+def measure(case, repeat=3):
+    runs = []
+    for _ in range(repeat):
+        work_dir = tempfile.mkdtemp(prefix="ipl_paint_")
+        try:
+            shared_cache_dir = os.path.join(work_dir, "shared")
+            scratch_copy(work_dir, keep_aggregates=case == "warm")
+            if case == "warm":
+                # Populate the aggregates and shared cache first, as a running deployment would have
+                run_app(work_dir, shared_cache_dir)
+            runs.append(run_app(work_dir, shared_cache_dir))
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    # Median run by total rerun time
+    finished, rerun = sorted(runs, key=lambda run: run[1])[len(runs) // 2]
+    print(f"\n{case}: full page {rerun * 1e3:.0f} ms (median of {repeat})")
+    for section, seconds in sorted(finished.items(), key=lambda item: item[1]):
+        print(f"  {section:<22} on the page at {seconds * 1e3:8.0f} ms")
+
+
+def main():
+    dataset_version()  # build the store being copied, if needed
+    for case in ("warm", "cold"):
+        measure(case)
+
+
+if __name__ == "__main__":
+    main()
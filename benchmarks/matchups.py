@@ -0,0 +1,68 @@
+"""Batter-vs-bowler lookups: a scan of deliveries vs the MatchupMatrix.
+
+Run from the repository root:
+
+    python -m benchmarks.matchups
+"""
+import time
+
+import numpy as np
+
+from aggregations import BOWLER_WICKET_KINDS, compute_base_aggregates
+from data_store import load_store
+from matchups import MATCHUP_STATS, MatchupMatrix
+
+
+def scan_lookup(deliveries, batter, bowler):
+    # What answering the question ad hoc costs: a full scan per query
+    balls = deliveries[(deliveries["batter"] == batter) & (deliveries["bowler"] == bowler)]
+    if balls.empty:
+        return None
+    return {
+        "runs": int(balls["batsman_runs"].sum()),
+        "balls": len(balls),
+        "dismissals": int(balls["dismissal_kind"].isin(BOWLER_WICKET_KINDS).sum()),
+        "dots": int((balls["total_runs"] == 0).sum()),
+        "boundaries": int(balls["batsman_runs"].isin([4, 6]).sum()),
+    }
+
+
+def time_per_call(fn, pairs):
+    start = time.perf_counter()
+    for batter, bowler in pairs:
+        fn(batter, bowler)
+    return (time.perf_counter() - start) / len(pairs)
+
+
+def main(n_pairs=200, seed=0):
+    matches, deliveries = load_store()
+    base = compute_base_aggregates(matches, deliveries)
+
+    start = time.perf_counter()
+    matrix = MatchupMatrix(base["matchups"])
+    build_time = time.perf_counter() - start
+
+    # Mostly pairs that met, plus some that never did
+    rng = np.random.default_rng(seed)
+    met = base["matchups"].iloc[rng.choice(len(base["matchups"]), size=n_pairs, replace=False)]
+    pairs = list(zip(met["batter"], met["bowler"]))
+    pairs += list(zip(rng.choice(matrix.batters, size=n_pairs // 4), rng.choice(matrix.bowlers, size=n_pairs // 4)))
+
+    for batter, bowler in pairs[:50]:
+        assert scan_lookup(deliveries, batter, bowler) == matrix.lookup(batter, bowler), (batter, bowler)
+
+    scan_time = time_per_call(lambda a, b: scan_lookup(deliveries, a, b), pairs)
+    matrix_time = time_per_call(matrix.lookup, pairs * 50)
+
+    print(f"deliveries rows:      {len(deliveries):,}")
+    print(f"players / pairs:      {len(matrix.players):,} / {len(matrix.indices):,}")
+    print(f"stats per pair:       {', '.join(MATCHUP_STATS)}")
+    print(f"matrix size:          {matrix.nbytes / 2**20:9.2f} MiB")
+    print(f"matrix build (once):  {build_time * 1e3:9.1f} ms")
+    print(f"scan lookup:          {scan_time * 1e6:9.1f} us/pair")
+    print(f"matrix lookup:        {matrix_time * 1e6:9.1f} us/pair")
+    print(f"speedup:              {scan_time / matrix_time:9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
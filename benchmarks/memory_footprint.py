@@ -0,0 +1,48 @@
+"""Resident size of matches/deliveries: original load path vs the typed store.
+
+Run from the repository root:
+
+    python -m benchmarks.memory_footprint
+"""
+import pandas as pd
+
+from data_store import DELIVERIES_CSV, MATCHES_CSV, load_store
+
+
+def original_load():
+    # load_data() as it was: default dtypes, a regex/apply season fix and a merge
+    matches = pd.read_csv(MATCHES_CSV)
+    deliveries = pd.read_csv(DELIVERIES_CSV)
+    matches["season"] = matches["season"].astype(str).str.extract(r'(\d{2,4})$')[0].astype(int)
+    matches["season"] = matches["season"].apply(lambda x: x + 2000 if x < 100 else x)
+    deliveries = deliveries.merge(matches[["id", "season"]], left_on="match_id", right_on="id", how="left")
+    return matches, deliveries
+
+
+def footprint(frame):
+    return frame.memory_usage(index=False, deep=True)
+
+
+def report(name, before, after):
+    before_bytes, after_bytes = footprint(before), footprint(after)
+    table = pd.DataFrame({
+        "before_dtype": before.dtypes.astype(str),
+        "after_dtype": after.dtypes.reindex(before.columns).astype(str),
+        "before_kb": (before_bytes / 1024).round(1),
+        "after_kb": (after_bytes.reindex(before.columns) / 1024).round(1),
+    })
+    print(f"\n{name}")
+    print(table.to_string())
+    print(f"total: {before_bytes.sum() / 2**20:.2f} MiB -> {after_bytes.sum() / 2**20:.2f} MiB "
+          f"({before_bytes.sum() / after_bytes.sum():.1f}x smaller)")
+
+
+def main():
+    matches_before, deliveries_before = original_load()
+    matches_after, deliveries_after = load_store()
+    report("matches", matches_before, matches_after)
+    report("deliveries", deliveries_before, deliveries_after)
+
+
+if __name__ == "__main__":
+    main()
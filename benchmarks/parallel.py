@@ -0,0 +1,63 @@
+"""Serial vs season-parallel base aggregates on the scaled synthetic dataset.
+
+Run from the repository root:
+
+    python -m benchmarks.parallel                          # 10x, 2/4/8/16 workers
+    python -m benchmarks.parallel --scale 100 --workers 4 16
+
+Builds a store from scaled copies of the cleaned CSVs (see benchmarks.suite)
+in a temporary directory, then times the serial path (load the whole store,
+compute_base_aggregates) against parallel_base_aggregates at each worker
+count, checking that every table matches. Speedup is bounded by the cores
+of the machine it runs on.
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+import pandas as pd
+
+from aggregations import BASE_KEYS
+from benchmarks.suite import write_scaled_csvs
+from data_store import build_store
+from parallel import parallel_base_aggregates
+
+
+def timed(fn):
+    start = time.perf_counter()
+    value = fn()
+    return value, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark season-parallel aggregation against the serial path.")
+    parser.add_argument("--scale", type=int, default=10)
+    parser.add_argument("--workers", type=int, nargs="+", default=[2, 4, 8, 16])
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix="ipl_parallel_")
+    try:
+        matches_csv, deliveries_csv = write_scaled_csvs(args.scale, work_dir)
+        store_dir = os.path.join(work_dir, "store")
+        build_store(matches_csv, deliveries_csv, store_dir)
+        print(f"scale {args.scale}x, {os.cpu_count()} cpus")
+
+        serial, serial_seconds = timed(lambda: parallel_base_aggregates(store_dir, workers=1))
+        print(f"  {'serial':<12} {serial_seconds:7.2f} s")
+
+        for workers in args.workers:
+            base, seconds = timed(lambda: parallel_base_aggregates(store_dir, workers))
+            for name, keys in BASE_KEYS.items():
+                pd.testing.assert_frame_equal(
+                    serial[name].sort_values(keys, ignore_index=True),
+                    base[name].sort_values(keys, ignore_index=True),
+                )
+            print(f"  {f'{workers} workers':<12} {seconds:7.2f} s  {serial_seconds / seconds:5.2f}x  (tables identical)")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Partnerships: the original two-groupby path vs the wicket-segment engine.
+
+Run from the repository root:
+
+    python -m benchmarks.partnerships
+
+The engine is first checked against a ball-by-ball walk of every innings,
+then both paths are timed over the full deliveries table.
+"""
+import time
+
+import numpy as np
+
+from data_store import load_store
+from partnerships import pair_totals, partnership_segments
+
+
+def groupby_partnerships(deliveries):
+    # The original app.py path: ordered pairs, batsman runs only, no wickets
+    partnerships = deliveries.groupby(["match_id", "batter", "non_striker"], observed=True)["batsman_runs"].sum().reset_index()
+    return partnerships.groupby(["batter", "non_striker"])["batsman_runs"].sum().reset_index()
+
+
+def engine_partnerships(deliveries):
+    return pair_totals(partnership_segments(deliveries))
+
+
+def walk_partnerships(deliveries):
+    # Reference: one Python pass over the balls, in order
+    ordered = deliveries.sort_values(["match_id", "inning", "over", "ball"], kind="stable")
+    stands = []
+    current = None
+    fallen = 0
+    for row in ordered[["match_id", "inning", "batter", "non_striker", "total_runs", "is_wicket"]].itertuples(index=False):
+        innings = (row.match_id, row.inning)
+        pair = tuple(sorted((str(row.batter), str(row.non_striker))))
+        if current is None or current[0] != innings:
+            fallen = 0
+        if current is None or current[0] != innings or current[1] != fallen or current[2] != pair:
+            current = [innings, fallen, pair, 0, 0]
+            stands.append(current)
+        current[3] += int(row.total_runs)
+        current[4] += 1
+        fallen += int(row.is_wicket)
+    return stands
+
+
+def best_of(fn, repeat=5):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main(check_matches=100):
+    _, deliveries = load_store()
+
+    sample = deliveries[deliveries["match_id"].isin(deliveries["match_id"].drop_duplicates().head(check_matches))]
+    segments = partnership_segments(sample)
+    actual = sorted(
+        (row.match_id, row.inning, row.wicket - 1, row.player_1, row.player_2, row.runs, row.balls)
+        for row in segments.itertuples(index=False)
+    )
+    expected = sorted(
+        (innings[0], innings[1], fallen, pair[0], pair[1], runs, balls)
+        for innings, fallen, pair, runs, balls in walk_partnerships(sample)
+    )
+    assert actual == expected
+
+    segments = partnership_segments(deliveries)
+    pairs = pair_totals(segments)
+    assert pairs["runs"].sum() == deliveries["total_runs"].sum()
+
+    groupby_time = best_of(lambda: groupby_partnerships(deliveries))
+    engine_time = best_of(lambda: engine_partnerships(deliveries))
+
+    print(f"deliveries rows:      {len(deliveries):,}")
+    print(f"partnerships:         {len(segments):,} ({len(pairs):,} pairs)")
+    print(f"checked against walk: {check_matches} matches")
+    print(f"two groupbys:         {groupby_time * 1e3:9.1f} ms")
+    print(f"segment engine:       {engine_time * 1e3:9.1f} ms")
+    print(f"speedup:              {groupby_time / engine_time:9.1f}x")
+    print(f"highest stand:        {int(np.max(segments['runs']))} runs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Player search latency: boolean-mask path vs the precomputed PlayerIndex.
+
+Run from the repository root:
+
+    python -m benchmarks.player_lookup
+"""
+import time
+
+import numpy as np
+import pandas as pd
+
+from aggregations import BOWLER_WICKET_KINDS, PlayerIndex, compute_base_aggregates
+from data_store import load_store
+
+
+def mask_lookup(deliveries, player):
+    # The original app.py path: two full scans plus two groupbys
+    player_stats = deliveries[deliveries["batter"] == player]
+    bowler_stats = deliveries[deliveries["bowler"] == player]
+
+    batting_summary = bowling_summary = None
+    if not player_stats.empty:
+        batting_summary = player_stats.groupby("season").agg(
+            total_runs=pd.NamedAgg(column="batsman_runs", aggfunc="sum"),
+            total_balls=pd.NamedAgg(column="ball", aggfunc="count"),
+            matches=pd.NamedAgg(column="match_id", aggfunc="nunique")
+        ).reset_index()
+        batting_summary["strike_rate"] = (batting_summary["total_runs"] / batting_summary["total_balls"] * 100).round(2)
+    if not bowler_stats.empty:
+        wicket_deliveries = bowler_stats[bowler_stats["dismissal_kind"].isin(BOWLER_WICKET_KINDS)]
+        bowling_summary = wicket_deliveries.groupby("season")["player_dismissed"].count().reset_index()
+        bowling_summary.rename(columns={"player_dismissed": "wickets"}, inplace=True)
+    return batting_summary, bowling_summary
+
+
+def index_lookup(index, player):
+    return index.batting_summary(player), index.bowling_summary(player)
+
+
+def time_per_call(fn, players):
+    start = time.perf_counter()
+    for player in players:
+        fn(player)
+    return (time.perf_counter() - start) / len(players)
+
+
+def main(n_players=200, seed=0):
+    matches, deliveries = load_store()
+
+    start = time.perf_counter()
+    index = PlayerIndex(compute_base_aggregates(matches, deliveries))
+    build_time = time.perf_counter() - start
+
+    all_players = sorted(set(deliveries["batter"].dropna().astype(str)) | set(deliveries["bowler"].dropna().astype(str)))
+    rng = np.random.default_rng(seed)
+    players = list(rng.choice(all_players, size=min(n_players, len(all_players)), replace=False))
+
+    # Both paths must agree before their timings mean anything
+    for player in players[:20]:
+        for expected, actual in zip(mask_lookup(deliveries, player), index_lookup(index, player)):
+            assert (expected is None) == (actual is None), player
+            if expected is not None:
+                np.testing.assert_array_equal(expected.to_numpy(), actual.to_numpy())
+
+    mask_time = time_per_call(lambda p: mask_lookup(deliveries, p), players)
+    index_time = time_per_call(lambda p: index_lookup(index, p), players)
+
+    print(f"deliveries rows:      {len(deliveries):,}")
+    print(f"index build (once):   {build_time * 1e3:9.1f} ms")
+    print(f"mask lookup:          {mask_time * 1e3:9.3f} ms/player")
+    print(f"index lookup:         {index_time * 1e3:9.3f} ms/player")
+    print(f"speedup:              {mask_time / index_time:9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Player-name suggestions: linear scan vs the prebuilt NameIndex.
+
+Run from the repository root:
+
+    python -m benchmarks.player_search
+
+Queries are random 1-6 letter slices of player names, in random case.
+The linear scan is the auto-suggest sketched in the old app.py comments
+(a substring test of every lowercased name), plus the same ranking. Every
+index result is checked against it first. The name table is then scaled
+up with suffixed copies of every name, as a stand-in for several leagues.
+Median and 90th percentile are reported; on a busy single-CPU host the top
+percent of any timing is scheduler preemption rather than the search.
+The index is also reloaded from its stored tables, as workers do, and
+must give the same results.
+"""
+import time
+
+import numpy as np
+import pandas as pd
+
+from data_store import load_aggregates
+from parallel import parallel_base_aggregates
+from player_search import SUGGESTIONS, NameIndex, name_table_from_base
+
+
+def linear_search(names, query, n=SUGGESTIONS):
+    query = " ".join(query.casefold().split())
+    ranked = names.sort_values(["balls", "key"], ascending=[False, True])
+    if not query:
+        return ranked["player"].head(n).tolist()
+    matches = ranked[[query in key for key in ranked["key"]]]
+
+    def tier(key):
+        return 0 if key.startswith(query) else 1 if (" " + query) in (" " + key) else 2
+
+    tiers = matches["key"].map(tier)
+    return matches.assign(tier=tiers).sort_values("tier", kind="stable")["player"].head(n).tolist()
+
+
+def random_queries(names, count, rng):
+    queries = []
+    for name in rng.choice(names, size=count):
+        length = int(rng.integers(1, 7))
+        start = int(rng.integers(0, max(len(name) - length, 0) + 1))
+        query = name[start:start + length]
+        queries.append(query.upper() if rng.random() < 0.3 else query.lower())
+    return queries
+
+
+def scaled(names, copies):
+    return pd.concat(
+        [names.assign(player=names["player"] + f" {copy}") for copy in range(copies)], ignore_index=True
+    )
+
+
+def per_query(fn, queries):
+    times = []
+    for query in queries:
+        start = time.perf_counter()
+        fn(query)
+        times.append(time.perf_counter() - start)
+    return np.array(times)
+
+
+def main(count=500, seed=0):
+    base = load_aggregates("base", parallel_base_aggregates, from_store=True)
+    names = name_table_from_base(base)["names"]
+    rng = np.random.default_rng(seed)
+
+    for copies in (1, 50):
+        table = scaled(names, copies) if copies > 1 else names
+        start = time.perf_counter()
+        index = NameIndex(table)
+        build_time = time.perf_counter() - start
+        tables = index.tables()
+        start = time.perf_counter()
+        loaded = NameIndex.from_tables(tables)
+        load_time = time.perf_counter() - start
+        table = table.assign(key=table["player"].str.casefold())
+
+        queries = random_queries(table["player"].to_numpy(), count, rng)
+        for query in queries[:100]:
+            assert index.search(query) == linear_search(table, query), query
+            assert loaded.search(query) == index.search(query), query
+
+        linear_times = per_query(lambda q: linear_search(table, q), queries)
+        index_times = per_query(index.search, queries)
+        print(
+            f"{len(table):,} names (index built in {build_time * 1e3:.0f} ms, loaded from its tables in "
+            f"{load_time * 1e3:.0f} ms), ms/query median / p90"
+        )
+        for label, times in [("linear scan", linear_times), ("NameIndex", index_times)]:
+            median, p90 = np.percentile(times, [50, 90]) * 1e3
+            print(f"  {label + ':':<13} {median:8.3f} / {p90:8.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""Exact vs sketched leaderboards and squad sizes on the IPL data.
+
+Run from the repository root:
+
+    python -m benchmarks.sketches
+    python -m benchmarks.sketches --capacity 200
+
+Sketches are built once per season partition and merged, and once per
+streamed chunk of the CSV and merged. Each sketched top-10 is checked
+against the exact leaderboard: same totals at every rank, and every listed
+player's exact total equal to the sketched one (players tied at the cut
+may differ). The capacity defaults to well under the number of players, so
+the Space-Saving summaries really are lossy; below about 55 on this data
+the 10th place is no longer resolved and the check fails, as it should.
+
+Squad sizes are compared against the exact distinct counts. At a dozen
+players a squad is counted from its empty registers, so an error there is
+a register collision (one player in eleven is 9%), not the 1.04 / sqrt(m)
+error of large counts.
+"""
+import argparse
+import math
+import time
+
+import numpy as np
+import pandas as pd
+
+from aggregations import compute_leaderboards, metric_columns
+from data_store import STORE_DIR, Dataset, load_store
+from sketches import SKETCH_BOARDS, CountMin, hash_keys, leaderboard_sketches, merge_sketches, sketch_leaderboards, stream_sketches
+from teams import squad
+
+
+def partition_sketches(dataset, capacity):
+    sketches = leaderboard_sketches(dataset.deliveries(seasons=[]), dataset.matches(), capacity)
+    for season in dataset.seasons:
+        sketches = merge_sketches(sketches, leaderboard_sketches(dataset.deliveries(seasons=[season]), capacity=capacity))
+    return sketches
+
+
+def exact_totals(matches, deliveries):
+    """Every key's exact total on every sketched board, not just the top 10."""
+    values = metric_columns(deliveries, [metric for _, _, metric, _ in SKETCH_BOARDS.values()])
+    totals = {
+        board: values[metric.name].groupby(deliveries[column].astype(str), observed=True).sum().to_dict()
+        for board, (_, _, metric, column) in SKETCH_BOARDS.items()
+    }
+    totals["impactful_players"] = matches["player_of_match"].astype(str).value_counts().to_dict()
+    return totals
+
+
+def check_boards(exact, approximate, totals, n=10):
+    for board in list(SKETCH_BOARDS) + ["impactful_players"]:
+        expected, actual = exact[board].head(n), approximate[board].head(n)
+        key_column, value_column = expected.columns[:2]
+        assert expected[value_column].tolist() == actual[value_column].tolist(), board
+        # Players tied at the cut may differ from the exact board's, but every total must be theirs
+        for key, value in zip(actual[key_column], actual[value_column]):
+            assert totals[board].get(key) == value, (board, key, value, totals[board].get(key))
+
+
+def _colliding_pairs(*columns):
+    sizes = pd.DataFrame({i: column for i, column in enumerate(columns)}).value_counts().to_numpy()
+    return int((sizes * (sizes - 1) // 2).sum())
+
+
+def check_count_min_rows(n_keys=20_000):
+    """Keys colliding in one Count-Min row should collide in another only by chance (1 / width)."""
+    keys = np.array([f"key {i}" for i in range(n_keys)], dtype=object)
+    count_min = CountMin().update(keys, np.ones(n_keys, dtype=np.int64))
+    columns = count_min._columns(hash_keys(keys))
+    first_row_pairs = _colliding_pairs(columns[0])
+    for row in range(1, count_min.depth):
+        shared = _colliding_pairs(columns[0], columns[row]) / first_row_pairs
+        assert shared < 3 / count_min.width, (row, shared)
+
+    # So the minimum over rows beats any single row
+    overestimate = (count_min.estimate(keys) - 1).mean()
+    single_row = (count_min.table[0, columns[0].astype(np.int64)] - 1).mean()
+    assert overestimate < 0.8 * single_row, (overestimate, single_row)
+    return overestimate, single_row
+
+
+def squad_errors(approximate, deliveries):
+    errors = []
+    for row in approximate.itertuples():
+        sides = deliveries[deliveries["season"] == row.season]
+        exact = len(squad(sides, row.team))
+        errors.append(abs(row.players - exact) / exact)
+    return pd.Series(errors)
+
+
+def sketch_bytes(sketches):
+    size = 0
+    for name, sketch in sketches.items():
+        if name == "squad_sizes":
+            size += sum(hll.registers.nbytes for hll in sketch.values())
+        else:
+            space_saving, count_min = sketch
+            size += space_saving.counts.memory_usage(deep=True) + space_saving.errors.memory_usage(deep=True)
+            size += count_min.table.nbytes
+    return size
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare exact and sketched leaderboards.")
+    parser.add_argument("--capacity", type=int, default=60)
+    parser.add_argument("--chunksize", type=int, default=50_000)
+    args = parser.parse_args()
+
+    matches, deliveries = load_store()
+    start = time.perf_counter()
+    exact = compute_leaderboards(matches, deliveries)
+    exact_time = time.perf_counter() - start
+    totals = exact_totals(matches, deliveries)
+
+    dataset = Dataset(STORE_DIR)
+    start = time.perf_counter()
+    by_partition = partition_sketches(dataset, args.capacity)
+    partition_time = time.perf_counter() - start
+    start = time.perf_counter()
+    by_chunk = stream_sketches(chunksize=args.chunksize, capacity=args.capacity)
+    chunk_time = time.perf_counter() - start
+
+    # Stream weight per board, for the Space-Saving error bound
+    weights = metric_columns(deliveries, [metric for _, _, metric, _ in SKETCH_BOARDS.values()]).sum()
+    players = pd.concat([deliveries["batter"], deliveries["bowler"]]).nunique()
+    print(f"{players} players, Space-Saving capacity {args.capacity}")
+    for label, sketches in [("season partitions", by_partition), ("streamed chunks", by_chunk)]:
+        approximate = sketch_leaderboards(sketches)
+        check_boards(exact, approximate, totals)
+        for board in SKETCH_BOARDS:
+            metric = SKETCH_BOARDS[board][2]
+            assert sketches[board][0].errors.max() <= math.ceil(weights[metric.name] / args.capacity), board
+
+        errors = squad_errors(approximate["squad_sizes"], deliveries)
+        print(f"{label}: top-10 of {len(SKETCH_BOARDS) + 1} boards agree with the exact boards")
+        print(f"  squad sizes: {len(errors)} team-seasons, mean error {errors.mean():.2%}, max {errors.max():.2%}")
+        print(f"  sketches: {sketch_bytes(sketches) / 2**10:,.0f} KiB")
+
+    overestimate, single_row = check_count_min_rows()
+    print(f"Count-Min rows collide independently: mean overestimate {overestimate:.2f}, one row {single_row:.2f}")
+    print(f"exact leaderboards:            {exact_time * 1e3:8.1f} ms")
+    print(f"sketches by season partition:  {partition_time * 1e3:8.1f} ms")
+    print(f"sketches by {args.chunksize:,}-row chunk:  {chunk_time * 1e3:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Query latency: pandas paths vs the embedded SQLite backend.
+
+Run from the repository root:
+
+    python -m benchmarks.sql_backend
+
+Times the bulk load once, then each dashboard query on both sides: the
+original whole-frame filter, the precomputed PlayerIndex and the
+pushed-down SQL for player search; the partition read vs SQL for the
+squad lookup; and leaderboards from the base tables vs SQL.
+"""
+import time
+
+import numpy as np
+
+from aggregations import PlayerIndex, compute_base_aggregates, leaderboards_from_base
+from benchmarks.player_lookup import mask_lookup, time_per_call
+from data_store import STORE_DIR, Dataset, load_store
+from sql_store import SqlBackend, build_sql_store
+from teams import squad
+
+
+def timed(fn, repeat=5):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def main(n_players=200, seed=0):
+    start = time.perf_counter()
+    backend = SqlBackend(build_sql_store())
+    load_time = time.perf_counter() - start
+
+    matches, deliveries = load_store()
+    base = compute_base_aggregates(matches, deliveries)
+    index = PlayerIndex(base)
+    dataset = Dataset(STORE_DIR)
+
+    rng = np.random.default_rng(seed)
+    players = list(rng.choice(index.players, size=min(n_players, len(index.players)), replace=False))
+    sides = matches[["season", "team1"]].drop_duplicates().to_numpy()
+    squads = [tuple(sides[i]) for i in rng.choice(len(sides), size=min(50, len(sides)), replace=False)]
+
+    # The SQL summaries must match the index before their timings mean anything
+    for player in players[:20]:
+        for expected, actual in [
+            (index.batting_summary(player), backend.batting_summary(player)),
+            (index.bowling_summary(player), backend.bowling_summary(player)),
+        ]:
+            assert (expected is None) == (actual is None), player
+            if expected is not None:
+                np.testing.assert_array_equal(expected.to_numpy(), actual.to_numpy())
+
+    mask_time = time_per_call(lambda p: mask_lookup(deliveries, p), players)
+    index_time = time_per_call(lambda p: (index.batting_summary(p), index.bowling_summary(p)), players)
+    sql_time = time_per_call(lambda p: (backend.batting_summary(p), backend.bowling_summary(p)), players)
+
+    def partition_squad(side):
+        season, team = int(side[0]), str(side[1])
+        return squad(dataset.deliveries(
+            seasons=[season], teams=[team], columns=["batting_team", "bowling_team", "batter", "bowler"]
+        ), team)
+
+    partition_squad_time = time_per_call(partition_squad, squads)
+    sql_squad_time = time_per_call(lambda side: backend.squad(str(side[1]), int(side[0])), squads)
+
+    base_boards_time = timed(lambda: leaderboards_from_base(base))
+    sql_boards_time = timed(backend.leaderboards)
+
+    print(f"deliveries rows:            {len(deliveries):,}")
+    print(f"SQLite bulk load + indexes: {load_time * 1e3:9.1f} ms")
+    print("player search (ms/player)")
+    print(f"  whole-frame mask:         {mask_time * 1e3:9.3f}")
+    print(f"  PlayerIndex:              {index_time * 1e3:9.3f}")
+    print(f"  SQL (covering indexes):   {sql_time * 1e3:9.3f}")
+    print("squad lookup (ms/team-season)")
+    print(f"  season partition read:    {partition_squad_time * 1e3:9.3f}")
+    print(f"  SQL:                      {sql_squad_time * 1e3:9.3f}")
+    print("leaderboards (ms, all boards)")
+    print(f"  from base tables:         {base_boards_time * 1e3:9.1f}")
+    print(f"  SQL:                      {sql_boards_time * 1e3:9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""In-memory vs streamed base aggregates: equality, time and peak memory.
+
+Run from the repository root:
+
+    python -m benchmarks.streaming              # the cleaned CSVs
+    python -m benchmarks.streaming --scale 10   # 10 copies, see benchmarks.suite
+
+Every mode runs in a fresh Python process, so its peak resident memory
+(VmHWM, Linux) is its own. The in-memory mode is the store build's path: read
+both CSVs whole, prepare them, aggregate. The streamed tables and
+leaderboards are checked against it, table for table.
+"""
+import argparse
+import json
+import os
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+from aggregations import BASE_KEYS, compute_base_aggregates, leaderboards_from_base
+from benchmarks.suite import write_scaled_csvs
+from data_store import DELIVERIES_CSV, DELIVERIES_DTYPES, MATCHES_CSV, MATCHES_DTYPES, prepare_frames, read_typed_csv
+from streaming import stream_base_aggregates
+from teams import display_name_mapping, load_teams
+
+
+def in_memory(matches_csv, deliveries_csv):
+    matches, deliveries = prepare_frames(
+        read_typed_csv(matches_csv, MATCHES_DTYPES),
+        read_typed_csv(deliveries_csv, DELIVERIES_DTYPES),
+        display_name_mapping(load_teams()),
+    )
+    return compute_base_aggregates(matches, deliveries)
+
+
+def peak_rss_mib():
+    # ru_maxrss survives exec on Linux, so a child would report its parent's peak
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) / 1024
+    return None
+
+
+def run_mode(mode, matches_csv, deliveries_csv, chunksize, workers):
+    # In a child process: time one mode and report its peak memory
+    start = time.perf_counter()
+    if mode == "in-memory":
+        in_memory(matches_csv, deliveries_csv)
+    else:
+        stream_base_aggregates(matches_csv, deliveries_csv, chunksize, workers)
+    seconds = time.perf_counter() - start
+
+    # The largest worker, for pooled runs
+    workers_peak = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024
+    print(json.dumps({"seconds": seconds, "peak_mib": peak_rss_mib(), "worker_peak_mib": workers_peak}))
+
+
+def measure(mode, matches_csv, deliveries_csv, chunksize=0, workers=0):
+    command = [
+        sys.executable, "-m", "benchmarks.streaming", "--run", mode,
+        "--matches", matches_csv, "--deliveries", deliveries_csv,
+        "--chunksize", str(chunksize), "--workers", str(workers),
+    ]
+    result = json.loads(subprocess.run(command, capture_output=True, text=True, check=True).stdout)
+    label = mode if mode == "in-memory" else f"streamed, {chunksize:,} rows x {workers} workers"
+    workers_note = f"  (largest worker {result['worker_peak_mib']:.0f} MiB)" if workers else ""
+    print(f"  {label:<38} {result['seconds']:7.2f} s {result['peak_mib']:8.0f} MiB peak{workers_note}")
+
+
+def check_equal(matches_csv, deliveries_csv, chunksize):
+    expected = in_memory(matches_csv, deliveries_csv)
+    streamed = stream_base_aggregates(matches_csv, deliveries_csv, chunksize)
+
+    # Both are keyed by the same strings; the streamed tables come sorted by key
+    for name, keys in BASE_KEYS.items():
+        pd.testing.assert_frame_equal(
+            expected[name].sort_values(keys, ignore_index=True),
+            streamed[name].sort_values(keys, ignore_index=True),
+        )
+    expected_boards, streamed_boards = leaderboards_from_base(expected), leaderboards_from_base(streamed)
+    for name, board in expected_boards.items():
+        pd.testing.assert_frame_equal(board, streamed_boards[name])
+    print(f"  {len(BASE_KEYS)} base tables and {len(expected_boards)} leaderboards identical")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare in-memory and streamed aggregation.")
+    parser.add_argument("--scale", type=int, default=1)
+    parser.add_argument("--chunksizes", type=int, nargs="+", default=[100_000, 500_000])
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--run", help=argparse.SUPPRESS)
+    parser.add_argument("--matches", default=MATCHES_CSV, help=argparse.SUPPRESS)
+    parser.add_argument("--deliveries", default=DELIVERIES_CSV, help=argparse.SUPPRESS)
+    parser.add_argument("--chunksize", type=int, default=0, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run:
+        run_mode(args.run, args.matches, args.deliveries, args.chunksize, args.workers)
+        return
+
+    work_dir = tempfile.mkdtemp(prefix="ipl_stream_")
+    try:
+        if args.scale == 1:
+            matches_csv, deliveries_csv = MATCHES_CSV, DELIVERIES_CSV
+        else:
+            matches_csv, deliveries_csv = write_scaled_csvs(args.scale, work_dir)
+        print(f"scale {args.scale}x ({os.path.getsize(deliveries_csv) / 2**20:,.0f} MiB of deliveries)")
+
+        check_equal(matches_csv, deliveries_csv, min(args.chunksizes))
+        measure("in-memory", matches_csv, deliveries_csv)
+        for chunksize in args.chunksizes:
+            measure("streamed", matches_csv, deliveries_csv, chunksize)
+            measure("streamed", matches_csv, deliveries_csv, chunksize, args.workers)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,285 @@
+"""Headless timings of every dashboard section, at 1x, 10x and 100x data.
+
+Run from the repository root:
+
+    python -m benchmarks.suite                        # scales 1, 10, 100
+    python -m benchmarks.suite --scales 1 10 --output before.json
+    python -m benchmarks.suite --compare before.json  # flag regressions
+    python -m benchmarks.suite --scales 1 --repeats 9  # steadier timings
+
+Scale 1 is the real cleaned CSVs. Scale k copies every match k times under
+new match ids and later seasons (the same players and teams, as if k times
+as many seasons had been played), writes the copies as CSVs and builds a
+store from them in a temporary directory, so each scale goes through the
+same load path as the dashboard.
+
+Every stage runs the computation behind one section, without Streamlit:
+once to warm up (imports, page cache, font and figure caches), then
+--repeats more times. It records the best and median of the timed runs,
+rows/sec at the best time (rows is the number of deliveries the stage
+covers) and, from a separate run, peak memory: the highest resident set
+size sampled during the run less the size before it. Resident size covers
+what tracemalloc cannot see, such as Arrow buffers, memory-mapped store
+files and the pandas C parser; the Arrow allocator's share is reported
+next to it. Results are written as JSON.
+
+--compare flags a stage when its best time is both REGRESSION_THRESHOLD
+times and NOISE_FLOOR_SECONDS slower than the saved run's, so
+millisecond stages do not trip on scheduler jitter.
+"""
+import argparse
+import ctypes
+import ctypes.util
+import datetime
+import gc
+import json
+import os
+import platform
+import resource
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from aggregations import PlayerIndex, compute_base_aggregates, leaderboards_from_base
+from chart_cache import render_figure
+from charts import (
+    plot_team_wins, plot_top_batsmen, plot_top_bowlers, plot_top_economy_bowlers, plot_top_partnerships,
+)
+from data_store import DELIVERIES_CSV, MATCHES_CSV, Dataset, build_store, parse_season
+from innings import innings_state
+from matchups import MatchupMatrix
+from partnerships import pair_totals, partnership_segments
+from teams import squad
+
+
+# Copies get ids far above any real match id (int32 still fits 100 copies)
+ID_STRIDE = 2_000_000
+REGRESSION_THRESHOLD = 1.2
+# Slowdowns smaller than this are within run-to-run noise, whatever the ratio
+NOISE_FLOOR_SECONDS = 0.01
+REPEATS = 5
+# How often the resident set size is sampled during the memory run
+RSS_INTERVAL = 0.001
+
+CHARTS = {
+    "team_wins": lambda boards: plot_team_wins(boards["team_wins"].set_index("team")["wins"]),
+    "top_batsmen": lambda boards: plot_top_batsmen(boards["top_batsmen"]),
+    "top_partnerships": lambda boards: plot_top_partnerships(boards["top_partnerships"]),
+    "top_bowlers": lambda boards: plot_top_bowlers(boards["top_bowlers"]),
+    "top_economy_bowlers": lambda boards: plot_top_economy_bowlers(boards["top_economy_bowlers"]),
+}
+
+
+def write_scaled_csvs(scale, out_dir, matches_csv=MATCHES_CSV, deliveries_csv=DELIVERIES_CSV):
+    """Write scale copies of the cleaned CSVs to out_dir; returns their paths."""
+    matches = pd.read_csv(matches_csv)
+    deliveries = pd.read_csv(deliveries_csv)
+    seasons = parse_season(matches["season"])
+    span = int(seasons.max() - seasons.min() + 1)
+
+    paths = os.path.join(out_dir, "matches.csv"), os.path.join(out_dir, "deliveries.csv")
+    # Written copy by copy, so memory stays at one copy whatever the scale
+    for copy in range(scale):
+        matches_copy = matches.assign(id=matches["id"] + copy * ID_STRIDE, season=seasons + copy * span)
+        deliveries_copy = deliveries.assign(match_id=deliveries["match_id"] + copy * ID_STRIDE)
+        matches_copy.to_csv(paths[0], mode="a" if copy else "w", header=not copy, index=False)
+        deliveries_copy.to_csv(paths[1], mode="a" if copy else "w", header=not copy, index=False)
+    return paths
+
+
+def _rss():
+    # Current resident set size; ru_maxrss (the process peak) where /proc is missing
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def _release_free_memory():
+    # Hand freed memory back to the OS, so the next run's peak is not hidden in it
+    gc.collect()
+    pa.default_memory_pool().release_unused()
+    libc = ctypes.util.find_library("c")
+    if libc and hasattr(ctypes.CDLL(libc), "malloc_trim"):
+        ctypes.CDLL(libc).malloc_trim(0)
+
+
+def peak_memory(fn):
+    """(peak resident bytes, peak Arrow allocator bytes) that fn adds while it runs."""
+    _release_free_memory()
+    base_rss = peak_rss = _rss()
+    base_arrow = peak_arrow = pa.total_allocated_bytes()
+    done = threading.Event()
+
+    def sample():
+        nonlocal peak_rss, peak_arrow
+        while not done.wait(RSS_INTERVAL):
+            peak_rss = max(peak_rss, _rss())
+            peak_arrow = max(peak_arrow, pa.total_allocated_bytes())
+
+    sampler = threading.Thread(target=sample, daemon=True)
+    sampler.start()
+    try:
+        value = fn()
+        peak_rss = max(peak_rss, _rss())
+        peak_arrow = max(peak_arrow, pa.total_allocated_bytes())
+    finally:
+        done.set()
+        sampler.join()
+    del value
+    return peak_rss - base_rss, peak_arrow - base_arrow
+
+
+def run_stage(results, scale, name, rows, fn, memory=True, repeats=REPEATS):
+    # The first, cold run only warms up; the best of the timed runs is the stage's time
+    start = time.perf_counter()
+    value = fn()
+    times = [time.perf_counter() - start]
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    timed = times[1:] or times
+    seconds = min(timed)
+    median = float(np.median(timed))
+
+    # Sampling slows the stage a little, so the peak comes from a separate run
+    peak = arrow_peak = None
+    if memory:
+        peak, arrow_peak = peak_memory(fn)
+
+    results.append({
+        "scale": scale,
+        "stage": name,
+        "rows": rows,
+        "seconds": round(seconds, 6),
+        "median_seconds": round(median, 6),
+        "first_seconds": round(times[0], 6),
+        "repeats": len(timed),
+        "peak_mib": None if peak is None else round(peak / 2**20, 2),
+        "arrow_peak_mib": None if arrow_peak is None else round(arrow_peak / 2**20, 2),
+        "rows_per_sec": round(rows / seconds) if rows and seconds else None,
+    })
+    memory_note = "" if peak is None else f" {peak / 2**20:9.1f} MiB (Arrow {arrow_peak / 2**20:.1f})"
+    print(f"  {name:<32} {seconds * 1e3:10.1f} ms (median {median * 1e3:.1f}){memory_note}")
+    return value
+
+
+def run_scale(scale, results, work_dir, memory=True, repeats=REPEATS, n_lookups=50):
+    if scale == 1:
+        matches_csv, deliveries_csv = MATCHES_CSV, DELIVERIES_CSV
+    else:
+        matches_csv, deliveries_csv = write_scaled_csvs(scale, work_dir)
+    store_dir = os.path.join(work_dir, f"store-{scale}")
+
+    with open(deliveries_csv) as f:
+        n_rows = sum(1 for _ in f) - 1
+    print(f"scale {scale}x ({n_rows:,} deliveries)")
+
+    def stage(name, rows, fn, repeats=repeats):
+        return run_stage(results, scale, name, rows, fn, memory, repeats)
+
+    # A build takes long enough that one timed run after the warm-up is steady
+    stage("build_store", n_rows, lambda: build_store(matches_csv, deliveries_csv, store_dir), repeats=min(repeats, 1))
+    dataset = Dataset(store_dir)
+    matches = stage("load_matches", None, dataset.matches)
+    deliveries = stage("load_deliveries", n_rows, dataset.deliveries)
+
+    base = stage("base_aggregates", n_rows, lambda: compute_base_aggregates(matches, deliveries))
+    boards = stage("leaderboards", n_rows, lambda: leaderboards_from_base(base))
+    for chart, plot in CHARTS.items():
+        stage(f"render:{chart}", None, lambda: render_figure(plot(boards)))
+
+    index = stage("player_index", n_rows, lambda: PlayerIndex(base))
+    players = list(np.random.default_rng(0).choice(index.players, size=min(n_lookups, len(index.players))))
+    stage(f"player_search x{len(players)}", None, lambda: [
+        (index.batting_summary(player), index.bowling_summary(player)) for player in players
+    ])
+
+    # The dashboard's squad lookup: one season partition, pushed-down team filter
+    season = int(matches["season"].max())
+    team = str(matches.loc[matches["season"] == season, "team1"].iloc[0])
+    stage("squad_lookup", None, lambda: squad(
+        dataset.deliveries(seasons=[season], teams=[team], columns=["batting_team", "bowling_team", "batter", "bowler"]),
+        team,
+    ))
+
+    stage("partnerships", n_rows, lambda: pair_totals(partnership_segments(deliveries)))
+    stage("innings_state", n_rows, lambda: innings_state(matches, deliveries))
+    stage("matchup_matrix", n_rows, lambda: MatchupMatrix(base["matchups"]))
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline_path, threshold=REGRESSION_THRESHOLD, floor=NOISE_FLOOR_SECONDS):
+    """Print each stage's best time against a saved run's; returns the regressed stages."""
+    with open(baseline_path) as f:
+        baseline = {(r["scale"], r["stage"]): r["seconds"] for r in json.load(f)["results"]}
+
+    regressions = []
+    print(f"\nvs {baseline_path} (flagged above {threshold:.1f}x and {floor * 1e3:.0f} ms slower)")
+    for result in results:
+        before = baseline.get((result["scale"], result["stage"]))
+        if not before:
+            continue
+        ratio = result["seconds"] / before
+        flag = "  REGRESSION" if ratio > threshold and result["seconds"] - before > floor else ""
+        print(f"  {result['scale']:>4}x {result['stage']:<32} {ratio:6.2f}x {(result['seconds'] - before) * 1e3:+9.1f} ms{flag}")
+        if flag:
+            regressions.append(result)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark every dashboard section headlessly.")
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--compare", help="earlier results JSON to compare against")
+    parser.add_argument("--repeats", type=int, default=REPEATS, help="timed runs of each stage after the warm-up")
+    parser.add_argument("--no-memory", action="store_true", help="skip the run that measures peak memory")
+    args = parser.parse_args()
+
+    results = []
+    work_dir = tempfile.mkdtemp(prefix="ipl_bench_")
+    try:
+        for scale in args.scales:
+            run_scale(scale, results, work_dir, memory=not args.no_memory, repeats=args.repeats)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    report = {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "cpus": os.cpu_count(),
+        },
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nWrote {len(results)} results to {args.output}")
+
+    if args.compare and compare(results, args.compare):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
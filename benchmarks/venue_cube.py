@@ -0,0 +1,84 @@
+"""Venue/season questions: a fresh join and scan vs slices of the cube.
+
+Run from the repository root:
+
+    python -m benchmarks.venue_cube
+
+Each question is "scoring by phase and team results at venue V in season
+S". The scan path joins matches onto deliveries and groups, as a one-off
+notebook query would; the cube path rolls up the precomputed tables. Both
+answers are compared first. Also times a full cube build against the
+incremental update ingest does when the latest season arrives.
+"""
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.player_lookup import time_per_call
+from cube import compute_cube, matches_cube, merge_cube, roll_up, store_cube, venue_names
+from data_store import load_store
+from innings import PHASES, REGULAR_INNINGS, phase_codes
+
+
+def scan_question(matches, deliveries, venue, season):
+    # Join, filter and group from scratch
+    venues = matches[["id"]].assign(venue=venue_names(matches["venue"]).astype(str))
+    balls = deliveries.merge(venues, left_on="match_id", right_on="id")
+    balls = balls[(balls["venue"] == venue) & (balls["season"] == season) & (balls["inning"] <= REGULAR_INNINGS)]
+    phase = np.asarray(PHASES, dtype=object)[phase_codes(balls["over"].to_numpy())]
+    phases = balls.groupby(phase).agg(
+        runs=pd.NamedAgg(column="total_runs", aggfunc="sum"),
+        balls=pd.NamedAgg(column="total_runs", aggfunc="count"),
+        wickets=pd.NamedAgg(column="is_wicket", aggfunc="sum"),
+    )
+    teams = matches_cube(matches[(venues["venue"] == venue) & (matches["season"] == season)])
+    return phases.reindex([p for p in PHASES if p in phases.index]), teams.groupby("team").sum(numeric_only=True)
+
+
+def cube_question(cube, venue, season):
+    return (
+        roll_up(cube["cube_innings"], ["phase"], venue=venue, season=season),
+        roll_up(cube["cube_matches"], ["team"], venue=venue, season=season),
+    )
+
+
+def main(n_questions=100, seed=0):
+    matches, deliveries = load_store()
+
+    start = time.perf_counter()
+    cube = store_cube()
+    build_time = time.perf_counter() - start
+
+    sides = cube["cube_matches"][["venue", "season"]].drop_duplicates().to_numpy()
+    rng = np.random.default_rng(seed)
+    questions = [tuple(sides[i]) for i in rng.choice(len(sides), size=min(n_questions, len(sides)), replace=False)]
+
+    for venue, season in questions[:20]:
+        scan_phases, scan_teams = scan_question(matches, deliveries, venue, season)
+        cube_phases, cube_teams = cube_question(cube, venue, season)
+        np.testing.assert_array_equal(scan_phases.to_numpy(), cube_phases[["runs", "balls", "wickets"]].to_numpy())
+        np.testing.assert_array_equal(
+            scan_teams[["matches", "wins", "chase_wins"]].to_numpy(), cube_teams[["matches", "wins", "chase_wins"]].to_numpy()
+        )
+
+    scan_time = time_per_call(lambda q: scan_question(matches, deliveries, *q), questions)
+    cube_time = time_per_call(lambda q: cube_question(cube, *q), questions)
+
+    # Incremental: the stored cube plus the cube of one new season's matches
+    last = matches["season"].max()
+    earlier = compute_cube(matches[matches["season"] < last], deliveries[deliveries["season"] < last])
+    start = time.perf_counter()
+    merge_cube(earlier, compute_cube(matches[matches["season"] == last], deliveries[deliveries["season"] == last]))
+    update_time = time.perf_counter() - start
+
+    print(f"cube: {len(cube['cube_innings']):,} innings rows, {len(cube['cube_matches']):,} match rows")
+    print(f"full build from the store:     {build_time * 1e3:9.1f} ms")
+    print(f"update with season {last}:        {update_time * 1e3:9.1f} ms")
+    print("venue x season question (ms/question)")
+    print(f"  join + scan:                 {scan_time * 1e3:9.3f}")
+    print(f"  cube roll-up:                {cube_time * 1e3:9.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Cache of rendered chart images.
+
+Charts only change when the dataset does, so each one is rendered once per
+(dataset version, chart id, parameters) and the PNG/SVG bytes are served
+from then on. The cache is an in-memory LRU bounded by total bytes.
+"""
+import io
+import json
+import threading
+from collections import OrderedDict
+
+import matplotlib.pyplot as plt
+
+
+# Same options st.pyplot uses, so cached images look identical
+SAVEFIG_OPTIONS = {"bbox_inches": "tight", "dpi": 200}
+
+
+def render_figure(fig, fmt="png"):
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format=fmt, **SAVEFIG_OPTIONS)
+    plt.close(fig)
+    return buffer.getvalue()
+
+
+class FigureCache:
+
+    def __init__(self, max_bytes=32 * 2**20):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._images = OrderedDict()
+        # Streamlit serves every session from its own thread
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(version, chart_id, params=None, fmt="png"):
+        return (version, chart_id, json.dumps(params or {}, sort_keys=True, default=str), fmt)
+
+    def get(self, key):
+        with self._lock:
+            image = self._images.get(key)
+            if image is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._images.move_to_end(key)
+            return image
+
+    def put(self, key, image):
+        with self._lock:
+            if key in self._images:
+                self.size -= len(self._images.pop(key))
+            self._images[key] = image
+            self.size += len(image)
+            while self.size > self.max_bytes and len(self._images) > 1:
+                _, evicted = self._images.popitem(last=False)
+                self.size -= len(evicted)
+                self.evictions += 1
+
+    def get_or_render(self, version, chart_id, plot, params=None, fmt="png"):
+        """Image bytes for a chart; plot() builds the matplotlib figure on a miss."""
+        key = self.key(version, chart_id, params, fmt)
+        image = self.get(key)
+        if image is None:
+            image = render_figure(plot(), fmt)
+            self.put(key, image)
+        return image
@@ -0,0 +1,78 @@
+"""Matplotlib/seaborn figures shown on the dashboard.
+
+Each function takes a leaderboard frame and returns the figure, so the
+dashboard can render it once and cache the image (see chart_cache.py).
+"""
+import matplotlib.pyplot as plt
+import seaborn as sns
+
+
+def plot_team_wins(team_wins):
+    fig, ax = plt.subplots(figsize=(10, 5))
+    sns.barplot(y=team_wins.index, x=team_wins.values, palette="viridis", ax=ax)
+    ax.set_xlabel("Total Wins")
+    ax.set_ylabel("Teams")
+    ax.set_title("Most Successful IPL Teams")
+
+    for index, value in enumerate(team_wins.values):
+        ax.text(value + 2, index, str(value), va='center', fontsize=12)
+
+    return fig
+
+
+def plot_top_batsmen(top_batsmen):
+    fig, ax = plt.subplots(figsize=(10, 5))
+    sns.barplot(y=top_batsmen["batter"], x=top_batsmen["batsman_runs"], palette="coolwarm", ax=ax)
+    ax.set_xlabel("Total Runs")
+    ax.set_ylabel("Batsmen")
+    ax.set_title("Top 10 IPL Batsmen by Runs")
+
+    # Add labels
+    for index, value in enumerate(top_batsmen["batsman_runs"]):
+        ax.text(value + 200, index, str(value), va='center', fontsize=12)
+
+    return fig
+
+
+def plot_top_partnerships(top_partnerships):
+    fig, ax = plt.subplots(figsize=(10, 5))
+    sns.barplot(y=top_partnerships["runs"],
+                x=top_partnerships["player_1"] + " & " + top_partnerships["player_2"],
+                palette="magma", ax=ax)
+    ax.set_ylabel("Total Runs")
+    ax.set_xlabel("Partnerships")
+    ax.set_title("Top 10 Highest IPL Partnerships by Runs")
+    plt.setp(ax.get_xticklabels(), rotation=45, ha='right')
+
+    for index, value in enumerate(top_partnerships["runs"]):
+        ax.text(index, value + 5, str(value), ha='center', fontsize=12)
+
+    return fig
+
+
+def plot_top_bowlers(top_bowlers):
+    fig, ax = plt.subplots(figsize=(10, 5))
+    sns.barplot(y=top_bowlers["bowler"], x=top_bowlers["wickets"], palette="magma", ax=ax)
+    ax.set_xlabel("Total Wickets")
+    ax.set_ylabel("Bowlers")
+    ax.set_title("Top 10 IPL Bowlers by Wickets")
+
+    # Add labels
+    for index, value in enumerate(top_bowlers["wickets"]):
+        ax.text(value + 2, index, str(value), va='center', fontsize=12)
+
+    return fig
+
+
+def plot_top_economy_bowlers(top_economy_bowlers):
+    fig, ax = plt.subplots(figsize=(10, 5))
+    sns.barplot(y=top_economy_bowlers["bowler"], x=top_economy_bowlers["economy"], palette="coolwarm", ax=ax)
+    ax.set_xlabel("Economy Rate")
+    ax.set_ylabel("Bowlers")
+    ax.set_title("Best Economy Rate Bowlers (Min 50 Overs)")
+
+    # Add labels
+    for index, value in enumerate(top_economy_bowlers["economy"]):
+        ax.text(value + 0.1, index, str(value), va='center', fontsize=12)
+
+    return fig
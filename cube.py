@@ -0,0 +1,182 @@
+"""Season x venue x team x phase cube for "X at venue V in season S" questions.
+
+    python cube.py --venue "Eden Gardens" --season 2016
+
+Two additive fact tables, materialized with the other aggregates:
+
+    cube_innings  (season, venue, team, phase)  runs, balls, wickets of the batting side
+    cube_matches  (season, venue, team)         matches, wins, toss_wins, toss_and_match_wins,
+                                                chases, chase_wins
+
+Every measure is a count or a sum, so a roll-up over any dimensions is a
+grouped sum, and the tables of newly ingested matches merge into the stored
+ones like the base aggregates do: only the (season, venue) slices the new
+matches fall in change. Phases and their totals come from the innings
+state, so super overs are not counted. Venues are normalized here (no city
+suffix, one name per ground); the cleaned files keep their original
+spelling.
+"""
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from data_store import STORE_DIR, Dataset, replace_categories
+from innings import PHASES, STATE_COLUMNS, innings_state, phase_totals
+
+CUBE_KEYS = {
+    "cube_innings": ["season", "venue", "team", "phase"],
+    "cube_matches": ["season", "venue", "team"],
+}
+DIMENSIONS = ["season", "venue", "team", "phase"]
+
+# Spellings and former names of the same ground, after the city suffix is dropped
+VENUE_NAME_MAPPING = {
+    "Feroz Shah Kotla": "Arun Jaitley Stadium",
+    "M.Chinnaswamy Stadium": "M Chinnaswamy Stadium",
+    "Punjab Cricket Association Stadium": "Punjab Cricket Association IS Bindra Stadium",
+    "Sardar Patel Stadium": "Narendra Modi Stadium",
+    "Subrata Roy Sahara Stadium": "Maharashtra Cricket Association Stadium",
+    "Zayed Cricket Stadium": "Sheikh Zayed Stadium",
+}
+
+
+def venue_names(venues):
+    """One name per ground: "Wankhede Stadium, Mumbai" -> "Wankhede Stadium"."""
+    names = {}
+    for venue in pd.unique(venues.dropna()):
+        ground = str(venue).split(",")[0].strip()
+        names[venue] = VENUE_NAME_MAPPING.get(ground, ground)
+    return replace_categories(venues, names)
+
+
+def venue_by_match(matches):
+    return pd.Series(venue_names(matches["venue"]).astype(str).to_numpy(), index=matches["id"].to_numpy())
+
+
+def innings_cube(state, venues):
+    """cube_innings from the innings state of some matches; venues: a Series of venue indexed by match id."""
+    phases = phase_totals(state)
+    keyed = pd.DataFrame({
+        "season": phases["season"].to_numpy(),
+        "venue": phases["match_id"].map(venues).to_numpy(),
+        "team": phases["batting_team"].astype(str).to_numpy(),
+        "phase": phases["phase"].astype(str).to_numpy(),
+        "runs": phases["runs"].to_numpy(dtype=np.int32),
+        "balls": phases["balls"].to_numpy(dtype=np.int32),
+        "wickets": phases["wickets"].to_numpy(dtype=np.int32),
+    })
+    return keyed.groupby(CUBE_KEYS["cube_innings"], sort=True).sum().reset_index()
+
+
+def matches_cube(matches):
+    """cube_matches, from both sides of every match."""
+    venues = venue_names(matches["venue"]).astype(str).to_numpy()
+    toss_winner = matches["toss_winner"].astype(str).to_numpy()
+    winner = matches["winner"].astype(str).to_numpy()
+    fielded = (matches["toss_decision"].astype(str) == "field").to_numpy()
+
+    sides = []
+    for column in ("team1", "team2"):
+        team = matches[column].astype(str).to_numpy()
+        won_toss = team == toss_winner
+        won = team == winner
+        # The side batting second: the toss winner if it chose to field, the other side if it chose to bat
+        chased = won_toss == fielded
+        sides.append(pd.DataFrame({
+            "season": matches["season"].to_numpy(),
+            "venue": venues,
+            "team": team,
+            "matches": 1,
+            "wins": won.astype(int),
+            "toss_wins": won_toss.astype(int),
+            "toss_and_match_wins": (won_toss & won).astype(int),
+            "chases": chased.astype(int),
+            "chase_wins": (chased & won).astype(int),
+        }))
+    return pd.concat(sides).groupby(CUBE_KEYS["cube_matches"], sort=True).sum().reset_index()
+
+
+def compute_cube(matches, deliveries):
+    return {
+        "cube_innings": innings_cube(innings_state(matches, deliveries), venue_by_match(matches)),
+        "cube_matches": matches_cube(matches),
+    }
+
+
+def merge_cube(*parts):
+    """Combine cube tables of disjoint sets of matches."""
+    merged = {}
+    for name in parts[0]:
+        combined = pd.concat([part[name] for part in parts], ignore_index=True)
+        merged[name] = combined.groupby(CUBE_KEYS[name], sort=True).sum().reset_index()
+    return merged
+
+
+def store_cube(store_dir=STORE_DIR):
+    """The cube of the stored dataset, one season partition of deliveries at a time."""
+    dataset = Dataset(store_dir)
+    matches = dataset.matches()
+    venues = venue_by_match(matches)
+    innings = [
+        innings_cube(innings_state(matches, dataset.deliveries(seasons=[season], columns=STATE_COLUMNS)), venues)
+        for season in dataset.seasons
+    ]
+    cube = merge_cube(*({"cube_innings": part} for part in innings))
+    cube["cube_matches"] = matches_cube(matches)
+    return cube
+
+
+def slice_cube(table, **filters):
+    """Rows of a cube table whose dimensions equal the given values (or are in the given lists)."""
+    mask = np.ones(len(table), dtype=bool)
+    for dimension, value in filters.items():
+        if value is None:
+            continue
+        values = table[dimension]
+        mask &= (values.isin(value) if isinstance(value, (list, tuple, set)) else values == value).to_numpy()
+    return table[mask]
+
+
+def roll_up(table, by, **filters):
+    """Measures of a slice summed over every dimension not in by (a single row when by is empty)."""
+    sliced = slice_cube(table, **filters)
+    measures = [column for column in table.columns if column not in DIMENSIONS]
+    if not by:
+        return sliced[measures].sum().to_frame().T
+    rolled = sliced.groupby(by, sort=True)[measures].sum().reset_index()
+    if "phase" in by:
+        rolled = rolled.sort_values("phase", key=lambda phase: phase.map(PHASES.index), kind="stable")
+    return rolled.reset_index(drop=True)
+
+
+def with_rates(frame):
+    """Add the rates the measures of a roll-up support (run rate, win percentages)."""
+    frame = frame.copy()
+
+    def ratio(numerator, denominator, scale):
+        return (frame[numerator] / frame[denominator].where(frame[denominator] > 0) * scale).round(2)
+
+    if "runs" in frame:
+        frame["run_rate"] = ratio("runs", "balls", 6)
+        frame["balls_per_wicket"] = ratio("balls", "wickets", 1)
+    if "matches" in frame:
+        frame["win_pct"] = ratio("wins", "matches", 100)
+        frame["toss_winner_won_pct"] = ratio("toss_and_match_wins", "toss_wins", 100)
+        frame["chase_win_pct"] = ratio("chase_wins", "chases", 100)
+    return frame
+
+
+if __name__ == "__main__":
+    from data_store import load_aggregates
+
+    parser = argparse.ArgumentParser(description="Roll up the venue cube.")
+    parser.add_argument("--venue")
+    parser.add_argument("--season", type=int)
+    args = parser.parse_args()
+
+    cube = load_aggregates("cube", store_cube, from_store=True)
+    filters = {"venue": args.venue, "season": args.season}
+    print(with_rates(roll_up(cube["cube_innings"], ["phase"], **filters)).to_string(index=False))
+    print()
+    print(with_rates(roll_up(cube["cube_matches"], ["team"], **filters)).to_string(index=False))
@@ -0,0 +1,558 @@
+"""Columnar on-disk store for the cleaned IPL data.
+
+Build (or rebuild) the store from the cleaned CSVs with:
+
+    python data_store.py
+
+The store is only rebuilt when the checksum of a source CSV changes.
+Deliveries are partitioned by season; open_dataset() returns a lazy Dataset
+that memory-maps just the partitions a query asks for, and load_store()
+returns the full frames.
+"""
+import argparse
+import fcntl
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from contextlib import contextmanager
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.feather as feather
+
+from teams import TEAMS_CSV, display_name_mapping, load_teams
+
+
+MATCHES_CSV = "matches_cleaned.csv"
+DELIVERIES_CSV = "deliveries_cleaned.csv"
+STORE_DIR = "ipl_store"
+MANIFEST = "manifest.json"
+AGGREGATES_DIR = "aggregates"
+MATCHES_TEAM_COLUMNS = ["team1", "team2", "toss_winner", "winner"]
+DELIVERIES_TEAM_COLUMNS = ["batting_team", "bowling_team"]
+
+# Bumped whenever the on-disk layout changes (including the layout of the
+# materialized aggregates, or what a stored column means), forcing a rebuild
+STORE_FORMAT = 7
+
+# Schema of the stored dataset, applied when the CSVs are parsed and kept
+# through every load: strings are dictionary encoded (pandas categoricals)
+# and counters use the narrowest int that fits. Sums over these columns are
+# upcast by pandas, but running totals (cumsum) must widen them first.
+MATCHES_DTYPES = {
+    "id": "int32",
+    "season": "int16",
+    "city": "category",
+    "match_type": "category",
+    "player_of_match": "category",
+    "venue": "category",
+    "team1": "category",
+    "team2": "category",
+    "toss_winner": "category",
+    "toss_decision": "category",
+    "winner": "category",
+    "result": "category",
+    "result_margin": "int16",
+    "target_runs": "float32",
+    "target_overs": "float32",
+    "super_over": "category",
+}
+
+DELIVERIES_DTYPES = {
+    "match_id": "int32",
+    "inning": "int8",
+    "batting_team": "category",
+    "bowling_team": "category",
+    "over": "int8",
+    "ball": "int8",
+    "batter": "category",
+    "bowler": "category",
+    "non_striker": "category",
+    "batsman_runs": "int8",
+    "extra_runs": "int8",
+    "total_runs": "int8",
+    "is_wicket": "int8",
+    "player_dismissed": "category",
+    "dismissal_kind": "category",
+    "season": "int16",
+}
+
+
+def file_checksum(path, chunk_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _source_info(path, previous=None):
+    stat = os.stat(path)
+    info = {"path": os.path.abspath(path), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+    # Skip re-hashing when size and mtime are unchanged since the last build
+    if previous and all(previous.get(k) == info[k] for k in ("path", "size", "mtime_ns")):
+        info["sha256"] = previous["sha256"]
+    else:
+        info["sha256"] = file_checksum(path)
+    return info
+
+
+def parse_season(season):
+    # "2007/08" -> 2008, "2009/10" -> 2010, "2011" -> 2011
+    years = season.astype(str).str.extract(r"(\d{2,4})$")[0].astype(int)
+    return years.where(years >= 100, years + 2000)
+
+
+def read_typed_csv(path, dtypes):
+    # Parse straight into the stored types, so the build never holds an
+    # object-dtype copy of the player/team columns. season is derived later.
+    return pd.read_csv(path, dtype={col: dtype for col, dtype in dtypes.items() if col != "season"})
+
+
+def apply_dtypes(df, dtypes):
+    return df.astype({col: dtype for col, dtype in dtypes.items() if col in df.columns})
+
+
+def prepare_matches(matches, team_names):
+    matches = matches.copy()
+    matches["season"] = parse_season(matches["season"])
+    matches = apply_dtypes(matches, MATCHES_DTYPES)
+    for column in MATCHES_TEAM_COLUMNS:
+        matches[column] = replace_categories(matches[column], team_names)
+    return matches
+
+
+def prepare_deliveries(deliveries, season_by_match, team_names):
+    # season_by_match: a Series of season indexed by match id
+    deliveries = deliveries.copy()
+    deliveries["season"] = deliveries["match_id"].map(season_by_match)
+    deliveries = apply_dtypes(deliveries, DELIVERIES_DTYPES)
+    for column in DELIVERIES_TEAM_COLUMNS:
+        deliveries[column] = replace_categories(deliveries[column], team_names)
+    return deliveries
+
+
+def season_by_match(matches):
+    return pd.Series(matches["season"].values, index=matches["id"].values)
+
+
+def prepare_frames(matches, deliveries, team_names):
+    """Derive season, join it onto deliveries, apply the stored column types
+    and canonicalize team names (team_names: any spelling -> display name)."""
+    matches = prepare_matches(matches, team_names)
+    return matches, prepare_deliveries(deliveries, season_by_match(matches), team_names)
+
+
+def read_manifest(store_dir=STORE_DIR):
+    try:
+        with open(os.path.join(store_dir, MANIFEST)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def write_table(df, path):
+    # Uncompressed Arrow IPC so the file can be memory-mapped on load
+    table = pa.Table.from_pandas(df, preserve_index=False)
+
+    # Same dictionary index width in every file, whatever the number of
+    # categories, so partitions written at different times concatenate
+    schema = pa.schema([
+        field.with_type(pa.dictionary(pa.int32(), pa.string()))
+        if pa.types.is_dictionary(field.type) else field
+        for field in table.schema
+    ])
+    table = table.cast(schema)
+
+    tmp_path = path + ".tmp"
+    feather.write_feather(table, tmp_path, compression="uncompressed")
+    os.replace(tmp_path, path)
+
+
+def _write_manifest(manifest, store_dir):
+    tmp_path = os.path.join(store_dir, MANIFEST + ".tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, os.path.join(store_dir, MANIFEST))
+
+
+def _matches_path(store_dir, partition):
+    return os.path.join(store_dir, "matches", partition + ".arrow")
+
+
+def _deliveries_path(store_dir, partition, season):
+    # Hive-style layout: one directory per season, one file per batch
+    return os.path.join(store_dir, "deliveries", f"season={season}", partition + ".arrow")
+
+
+def _partition_files(store_dir, partition):
+    yield _matches_path(store_dir, partition["name"])
+    for season in partition["seasons"]:
+        yield _deliveries_path(store_dir, partition["name"], season)
+
+
+def next_version(version, checksum):
+    return hashlib.sha256((version + checksum).encode()).hexdigest()[:16]
+
+
+def source_version(sources):
+    """The version of a store built from these sources (name -> info with a sha256)."""
+    # The format is part of the version, so caches keyed by version
+    # (shared frames, rendered charts) are dropped by a layout change too
+    return next_version(
+        f"{STORE_FORMAT}:" + sources["matches"]["sha256"],
+        sources["deliveries"]["sha256"] + sources["teams"]["sha256"],
+    )
+
+
+def _write_partition(matches, deliveries, name, store_dir):
+    write_table(matches, _matches_path(store_dir, name))
+
+    seasons = []
+    for season, season_deliveries in deliveries.groupby("season", sort=True):
+        season = int(season)
+        os.makedirs(os.path.dirname(_deliveries_path(store_dir, name, season)), exist_ok=True)
+        write_table(season_deliveries, _deliveries_path(store_dir, name, season))
+        seasons.append(season)
+
+    return {"name": name, "seasons": seasons}
+
+
+def _source_paths(matches_csv, deliveries_csv):
+    # The team dimension is a source too: editing it re-canonicalizes the store
+    return {"matches": matches_csv, "deliveries": deliveries_csv, "teams": TEAMS_CSV}
+
+
+def build_store(matches_csv=MATCHES_CSV, deliveries_csv=DELIVERIES_CSV, store_dir=STORE_DIR):
+    """Parse the cleaned CSVs once and write the typed columnar dataset."""
+    previous = read_manifest(store_dir) or {}
+    previous_sources = previous.get("sources", {})
+    sources = {
+        name: _source_info(path, previous_sources.get(name))
+        for name, path in _source_paths(matches_csv, deliveries_csv).items()
+    }
+
+    matches, deliveries = prepare_frames(
+        read_typed_csv(matches_csv, MATCHES_DTYPES),
+        read_typed_csv(deliveries_csv, DELIVERIES_DTYPES),
+        display_name_mapping(load_teams()),
+    )
+
+    # A rebuild starts over from the CSVs, dropping previously ingested batches
+    for table in ("matches", "deliveries"):
+        shutil.rmtree(os.path.join(store_dir, table), ignore_errors=True)
+        os.makedirs(os.path.join(store_dir, table))
+
+    manifest = {
+        "format": STORE_FORMAT,
+        "version": source_version(sources),
+        "sources": sources,
+        "partitions": [_write_partition(matches, deliveries, "part-00000", store_dir)],
+    }
+    _write_manifest(manifest, store_dir)
+
+    return manifest
+
+
+def append_partition(matches, deliveries, checksum, store_dir=STORE_DIR):
+    """Append frames returned by prepare_frames as a new partition and bump the dataset version."""
+    manifest = read_manifest(store_dir)
+
+    name = f"part-{len(manifest['partitions']):05d}"
+    partition = _write_partition(matches, deliveries, name, store_dir)
+
+    # The manifest is replaced last, so readers never see a half-written partition
+    manifest["partitions"].append(partition)
+    manifest["version"] = next_version(manifest["version"], checksum)
+    _write_manifest(manifest, store_dir)
+
+    return manifest
+
+
+def store_is_current(matches_csv=MATCHES_CSV, deliveries_csv=DELIVERIES_CSV, store_dir=STORE_DIR):
+    manifest = read_manifest(store_dir)
+    if manifest is None or manifest.get("format") != STORE_FORMAT:
+        return False
+
+    sources = manifest.get("sources", {})
+    for name, path in _source_paths(matches_csv, deliveries_csv).items():
+        if name not in sources or not os.path.exists(path):
+            return False
+        if _source_info(path, sources[name])["sha256"] != sources[name]["sha256"]:
+            return False
+
+    return all(
+        os.path.exists(path)
+        for partition in manifest["partitions"]
+        for path in _partition_files(store_dir, partition)
+    )
+
+
+@contextmanager
+def file_lock(path):
+    """Exclusive lock shared by every process on the host (flock on path)."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "a") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def _store_lock(store_dir, name="store"):
+    return file_lock(os.path.join(store_dir, f".{name}.lock"))
+
+
+def aggregate_lock(name, store_dir=STORE_DIR):
+    """The lock load_aggregates() holds while it computes and writes aggregates/<name>."""
+    return _store_lock(store_dir, name)
+
+
+def dataset_version(matches_csv=MATCHES_CSV, deliveries_csv=DELIVERIES_CSV, store_dir=STORE_DIR):
+    """Version of the current dataset, building the store first if needed."""
+    if not store_is_current(matches_csv, deliveries_csv, store_dir):
+        # Several workers may start at once; only the first one builds
+        with _store_lock(store_dir):
+            if not store_is_current(matches_csv, deliveries_csv, store_dir):
+                build_store(matches_csv, deliveries_csv, store_dir)
+    return read_manifest(store_dir)["version"]
+
+
+def stored_match_ids(store_dir=STORE_DIR):
+    return set(Dataset(store_dir).matches(columns=["id"])["id"])
+
+
+def _read_table(path):
+    return feather.read_table(path, memory_map=True).to_pandas()
+
+
+def _team_filter(table, teams, columns):
+    value_set = pa.array(list(teams), type=pa.string())
+    mask = None
+    for column in columns:
+        column_mask = pc.is_in(table[column], value_set=value_set)
+        mask = column_mask if mask is None else pc.or_(mask, column_mask)
+    return table.filter(mask)
+
+
+def deliveries_paths(store_dir, partitions):
+    """(season, path) of every deliveries file of the given manifest partitions."""
+    return [
+        (season, _deliveries_path(store_dir, p["name"], season))
+        for p in partitions
+        for season in p["seasons"]
+    ]
+
+
+class Dataset:
+    """Lazy handle on the stored dataset.
+
+    Nothing is read up front. matches() and deliveries() accept season and
+    team predicates: seasons select which season partitions are opened at
+    all, teams filter the rows of those partitions before they are converted
+    to pandas. Files are memory-mapped, so unread partitions cost nothing.
+    """
+
+    def __init__(self, store_dir=STORE_DIR):
+        self.store_dir = store_dir
+        manifest = read_manifest(store_dir)
+        self.version = manifest["version"]
+        self.partitions = manifest["partitions"]
+        self.seasons = sorted({season for p in self.partitions for season in p["seasons"]})
+
+    def _read(self, paths, teams, team_columns, columns):
+        if teams is not None:
+            read_columns = None if columns is None else list(dict.fromkeys(columns + team_columns))
+        else:
+            read_columns = columns
+        tables = [feather.read_table(path, columns=read_columns, memory_map=True) for path in paths]
+        table = pa.concat_tables(tables)
+        if teams is not None:
+            table = _team_filter(table, teams, team_columns)
+            if columns is not None:
+                table = table.select(columns)
+        # Release each Arrow column as soon as it has been converted
+        return table.to_pandas(split_blocks=True, self_destruct=True)
+
+    def matches(self, seasons=None, teams=None, columns=None):
+        paths = [_matches_path(self.store_dir, p["name"]) for p in self.partitions]
+        matches = self._read(paths, teams, ["team1", "team2"], columns)
+        if seasons is not None:
+            # matches is small enough that the season filter happens in pandas
+            matches = matches[matches["season"].isin(list(seasons))].reset_index(drop=True)
+        return matches
+
+    def deliveries(self, seasons=None, teams=None, columns=None):
+        """Deliveries of the given seasons involving any of the given teams."""
+        paths = [
+            path for season, path in deliveries_paths(self.store_dir, self.partitions)
+            if seasons is None or season in seasons
+        ]
+        if not paths:
+            return pd.DataFrame(columns=columns or list(DELIVERIES_DTYPES))
+        return self._read(paths, teams, ["batting_team", "bowling_team"], columns)
+
+
+def open_dataset(matches_csv=MATCHES_CSV, deliveries_csv=DELIVERIES_CSV, store_dir=STORE_DIR):
+    dataset_version(matches_csv, deliveries_csv, store_dir)
+    return Dataset(store_dir)
+
+
+def load_store(matches_csv=MATCHES_CSV, deliveries_csv=DELIVERIES_CSV, store_dir=STORE_DIR):
+    """Return (matches, deliveries), rebuilding the store if a source CSV changed."""
+    dataset = open_dataset(matches_csv, deliveries_csv, store_dir)
+    return dataset.matches(), dataset.deliveries()
+
+
+def read_aggregates(name, store_dir=STORE_DIR, version=None):
+    """Return (version, frames) stored under aggregates/<name>, or (None, None).
+
+    When version is given and differs from the stored one, the frames are
+    not read and (stored version, None) is returned.
+    """
+    # Resolved once, so every table comes from the same published set
+    aggregate_dir = os.path.realpath(os.path.join(store_dir, AGGREGATES_DIR, name))
+    try:
+        with open(os.path.join(aggregate_dir, "version.json")) as f:
+            stored = json.load(f)
+    except (OSError, ValueError):
+        return None, None
+    # Aggregates written by an older layout are treated as missing
+    if stored.get("format") != STORE_FORMAT:
+        return None, None
+    if version is not None and stored["version"] != version:
+        return stored["version"], None
+
+    frames = {
+        table: _read_table(os.path.join(aggregate_dir, table + ".arrow"))
+        for table in stored["tables"]
+    }
+    return stored["version"], frames
+
+
+def write_aggregates(name, frames, version, store_dir=STORE_DIR):
+    """Publish frames as aggregates/<name> for version; call it under aggregate_lock(name).
+
+    The tables and their version.json go to a fresh directory, and
+    aggregates/<name> is a symlink swapped onto it with one os.replace, so
+    readers see the previous set or the new one, never a mix. The previous
+    directory is kept for readers that resolved the link just before.
+    """
+    aggregates_dir = os.path.join(store_dir, AGGREGATES_DIR)
+    os.makedirs(aggregates_dir, exist_ok=True)
+    link = os.path.join(aggregates_dir, name)
+    previous = os.path.realpath(link) if os.path.islink(link) else None
+
+    tables_dir = tempfile.mkdtemp(prefix=f".{name}-", dir=aggregates_dir)
+    os.chmod(tables_dir, 0o755)
+    for table, frame in frames.items():
+        write_table(frame, os.path.join(tables_dir, table + ".arrow"))
+    with open(os.path.join(tables_dir, "version.json"), "w") as f:
+        json.dump({"format": STORE_FORMAT, "version": version, "tables": sorted(frames)}, f, indent=2)
+
+    if os.path.isdir(link) and not os.path.islink(link):
+        # Written before aggregates were published through a link
+        shutil.rmtree(link)
+    tmp_link = link + ".tmp"
+    if os.path.lexists(tmp_link):
+        os.remove(tmp_link)
+    os.symlink(os.path.basename(tables_dir), tmp_link)
+    os.replace(tmp_link, link)
+
+    for entry in os.listdir(aggregates_dir):
+        path = os.path.join(aggregates_dir, entry)
+        if entry.startswith(f".{name}-") and path not in (tables_dir, previous):
+            shutil.rmtree(path, ignore_errors=True)
+
+
+def drop_aggregates(name, store_dir=STORE_DIR):
+    """Remove aggregates/<name>; it is computed again the next time it is loaded."""
+    aggregates_dir = os.path.join(store_dir, AGGREGATES_DIR)
+    link = os.path.join(aggregates_dir, name)
+    if os.path.islink(link):
+        os.remove(link)
+    elif os.path.isdir(link):
+        shutil.rmtree(link)
+    if os.path.isdir(aggregates_dir):
+        for entry in os.listdir(aggregates_dir):
+            if entry.startswith(f".{name}-"):
+                shutil.rmtree(os.path.join(aggregates_dir, entry), ignore_errors=True)
+
+
+def stored_aggregates(store_dir=STORE_DIR):
+    """Names of the aggregates materialized in the store."""
+    aggregates_dir = os.path.join(store_dir, AGGREGATES_DIR)
+    if not os.path.isdir(aggregates_dir):
+        return []
+    return sorted(entry for entry in os.listdir(aggregates_dir) if not entry.startswith(".") and not entry.endswith(".tmp"))
+
+
+def load_aggregates(
+    name, compute, matches_csv=MATCHES_CSV, deliveries_csv=DELIVERIES_CSV, store_dir=STORE_DIR, from_store=False,
+):
+    """Return the frames materialized under aggregates/<name> for the current dataset version.
+
+    compute(matches, deliveries) must return a dict of DataFrames; it only
+    runs when nothing has been stored yet for this version. With from_store,
+    compute(store_dir) is given the store to read itself instead; that is
+    also the way to go for aggregates derived from other aggregates, which
+    need no deliveries at all.
+    """
+    version = dataset_version(matches_csv, deliveries_csv, store_dir)
+    stored_version, frames = read_aggregates(name, store_dir, version)
+    if stored_version == version:
+        return frames
+
+    with _store_lock(store_dir, name):
+        stored_version, frames = read_aggregates(name, store_dir, version)
+        if stored_version == version:
+            return frames
+
+        frames = compute(store_dir) if from_store else compute(*load_store(matches_csv, deliveries_csv, store_dir))
+        write_aggregates(name, frames, version, store_dir)
+        return frames
+
+
+def replace_categories(series, mapping):
+    """Categorical-safe equivalent of series.replace(mapping).
+
+    Only the category labels are rewritten, so the cost does not depend on
+    the number of rows. Labels that collapse onto the same name are merged.
+    """
+    if not isinstance(series.dtype, pd.CategoricalDtype):
+        return series.replace(mapping)
+
+    old_categories = series.cat.categories
+    new_labels = old_categories.map(lambda name: mapping.get(name, name))
+    new_categories = pd.Index(new_labels.unique())
+    remap = new_categories.get_indexer(new_labels)
+
+    codes = series.cat.codes.to_numpy()
+    new_codes = remap.take(codes)
+    new_codes[codes == -1] = -1
+
+    return pd.Series(
+        pd.Categorical.from_codes(new_codes, categories=new_categories),
+        index=series.index,
+        name=series.name,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the columnar IPL dataset from the cleaned CSVs.")
+    parser.add_argument("--matches", default=MATCHES_CSV)
+    parser.add_argument("--deliveries", default=DELIVERIES_CSV)
+    parser.add_argument("--store-dir", default=STORE_DIR)
+    parser.add_argument("--force", action="store_true", help="rebuild even if the sources are unchanged")
+    args = parser.parse_args()
+
+    if not args.force and store_is_current(args.matches, args.deliveries, args.store_dir):
+        print(f"Store in {args.store_dir} is up to date.")
+    else:
+        manifest = build_store(args.matches, args.deliveries, args.store_dir)
+        print(f"Built {args.store_dir} (version {manifest['version']}).")
@@ -0,0 +1,93 @@
+"""Append newly played matches to the dataset without rebuilding it.
+
+    python ingest.py new_matches.csv new_deliveries.csv
+
+The files use the raw layout of matches.csv / deliveries.csv. They are
+cleaned like the notebook does, stored as a new partition, and the base
+aggregates, leaderboards, player names and venue cube are updated from the
+new balls only. Any other materialized aggregate is dropped, to be computed
+again on its next load.
+"""
+import argparse
+import hashlib
+import os
+
+import numpy as np
+import pandas as pd
+
+from aggregations import compute_base_aggregates, leaderboards_from_base, merge_base_aggregates
+from cleaning import clean
+from cube import compute_cube, merge_cube
+from data_store import (
+    STORE_DIR, aggregate_lock, append_partition, dataset_version, drop_aggregates, file_checksum, file_lock,
+    prepare_frames, read_aggregates, read_manifest, stored_aggregates, stored_match_ids, write_aggregates,
+)
+from player_search import name_table_from_base
+from teams import display_name_mapping, load_teams
+
+
+def ingest(matches_csv, deliveries_csv, store_dir=STORE_DIR):
+    dataset_version(store_dir=store_dir)
+    # One writer at a time; readers keep using the previous manifest until
+    # the new one is swapped in
+    with file_lock(os.path.join(store_dir, ".store.lock")):
+        return _ingest(matches_csv, deliveries_csv, store_dir)
+
+
+def _ingest(matches_csv, deliveries_csv, store_dir):
+    version = read_manifest(store_dir)["version"]
+
+    # Validated (schema, orphan deliveries) before anything is cleaned
+    matches, deliveries, _ = clean(
+        pd.read_csv(matches_csv, engine="pyarrow"), pd.read_csv(deliveries_csv, engine="pyarrow")
+    )
+    # The cleaned CSVs read "None" back as NaN; keep new batches consistent
+    deliveries["dismissal_kind"] = deliveries["dismissal_kind"].replace("None", np.nan)
+
+    duplicates = set(matches["id"]) & stored_match_ids(store_dir)
+    if duplicates:
+        raise ValueError(f"Matches already in the dataset: {sorted(duplicates)}")
+
+    matches, deliveries = prepare_frames(matches, deliveries, display_name_mapping(load_teams()))
+    checksum = hashlib.sha256((file_checksum(matches_csv) + file_checksum(deliveries_csv)).encode()).hexdigest()
+
+    # Read the current aggregates before the version moves on
+    _, base = read_aggregates("base", store_dir, version)
+    _, cube = read_aggregates("cube", store_dir, version)
+
+    manifest = append_partition(matches, deliveries, checksum, store_dir)
+    new_version = manifest["version"]
+
+    # Without stored aggregates for the previous version there is nothing to
+    # update; they get computed in full the next time they are loaded
+    updates = {}
+    if base is not None:
+        base = merge_base_aggregates(base, compute_base_aggregates(matches, deliveries))
+        updates["base"] = base
+        updates["leaderboards"] = leaderboards_from_base(base)
+        updates["player_names"] = name_table_from_base(base)
+    if cube is not None:
+        # Only the (season, venue) slices of the new matches change
+        updates["cube"] = merge_cube(cube, compute_cube(matches, deliveries))
+
+    # Each under the lock load_aggregates() takes, so a reader never
+    # computes and writes the same aggregate concurrently
+    for name in sorted(set(stored_aggregates(store_dir)) | set(updates)):
+        with aggregate_lock(name, store_dir):
+            if name in updates:
+                write_aggregates(name, updates[name], new_version, store_dir)
+            else:
+                drop_aggregates(name, store_dir)
+
+    return manifest
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Append new matches and deliveries to the IPL dataset.")
+    parser.add_argument("matches", help="CSV of new matches (raw matches.csv layout)")
+    parser.add_argument("deliveries", help="CSV of their deliveries (raw deliveries.csv layout)")
+    parser.add_argument("--store-dir", default=STORE_DIR)
+    args = parser.parse_args()
+
+    manifest = ingest(args.matches, args.deliveries, args.store_dir)
+    print(f"Ingested {args.matches} (version {manifest['version']}).")
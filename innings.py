@@ -0,0 +1,144 @@
+"""Ball-by-ball innings state of a batch of deliveries.
+
+Every delivery gets the state of its innings after that ball: score,
+wickets, balls left, run rates and the phase of play. Totals, phase splits,
+chases and score progressions are then read off the running totals of
+this table rather than fresh groupbys over the raw deliveries. The state
+is not materialized: the venue cube, the one stored table built from it,
+derives it one season partition at a time and keeps only the phase splits.
+
+Innings 1 and 2 are the match proper. Higher innings are super overs (six
+balls; the even one chases the odd one before it) and belong to no phase.
+"""
+import numpy as np
+import pandas as pd
+
+from aggregations import DEATH_OVERS
+
+
+POWERPLAY_OVERS = (0, 5)
+PHASES = ["powerplay", "middle", "death"]
+BALLS_PER_INNINGS = 120
+REGULAR_INNINGS = 2
+SUPER_OVER_BALLS = 6
+
+STATE_COLUMNS = [
+    "match_id", "inning", "season", "batting_team", "bowling_team", "over", "ball",
+    "total_runs", "is_wicket",
+]
+
+
+def phase_codes(over):
+    """Position in PHASES of the phase each (0-based) over falls in."""
+    return np.where(over <= POWERPLAY_OVERS[1], 0, np.where(over < DEATH_OVERS[0], 1, 2))
+
+
+def innings_state(matches, deliveries):
+    """One row per delivery with the innings state after it.
+
+    Extras are not typed in the cleaned files, so balls bowled counts whole
+    overs plus the ball number capped at six; it is exact at the end of
+    every over. Targets apply to chasing innings only (NaN otherwise): the
+    second innings, and the second super over of each pair. Rows are sorted
+    by match, innings and ball, which phase_totals and score_progression
+    rely on.
+    """
+    state = deliveries[STATE_COLUMNS].sort_values(["match_id", "inning", "over", "ball"], kind="stable")
+    state = state.reset_index(drop=True)
+    keys = [state["match_id"], state["inning"]]
+
+    # Widened first: int8 running sums would overflow past 127
+    state["score"] = state["total_runs"].astype("int16").groupby(keys, sort=False).cumsum()
+    state["wickets"] = state["is_wicket"].groupby(keys, sort=False).cumsum().astype("int8")
+    state["balls_bowled"] = (
+        state["over"].astype("int16") * 6 + np.minimum(state["ball"], 6)
+    ).astype("int16")
+
+    targets = matches.set_index("id")[["target_runs", "target_overs"]]
+    inning = state["inning"].to_numpy()
+    chase = inning == 2
+    super_over = inning > REGULAR_INNINGS
+    target = state["match_id"].map(targets["target_runs"]).to_numpy(dtype=np.float32)
+    target_overs = state["match_id"].map(targets["target_overs"]).to_numpy(dtype=np.float32)
+    target = np.where(chase, target, np.nan).astype(np.float32)
+    if super_over.any():
+        # The side batting second in a super over needs one more than the first side's total
+        super_overs = state[super_over]
+        totals = super_overs[~super_overs.duplicated(["match_id", "inning"], keep="last")]
+        totals = totals[totals["inning"] % 2 == 1]
+        super_targets = pd.Series(
+            (totals["score"] + 1).to_numpy(dtype=np.float32),
+            index=pd.MultiIndex.from_arrays([totals["match_id"], totals["inning"] + 1]),
+        )
+        target[super_over] = super_targets.reindex(
+            pd.MultiIndex.from_arrays([super_overs["match_id"], super_overs["inning"]])
+        ).to_numpy()
+    state["target"] = target
+
+    # Rain-reduced chases have fewer overs; first innings are taken as 20
+    innings_balls = np.where(chase & ~np.isnan(target_overs), np.round(target_overs * 6), BALLS_PER_INNINGS)
+    innings_balls = np.where(super_over, SUPER_OVER_BALLS, innings_balls)
+    state["balls_remaining"] = np.maximum(innings_balls - state["balls_bowled"], 0).astype("int16")
+
+    balls_bowled = state["balls_bowled"].to_numpy(dtype=np.float32)
+    balls_remaining = state["balls_remaining"].to_numpy(dtype=np.float32)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        state["run_rate"] = np.where(balls_bowled > 0, state["score"] / balls_bowled * 6, 0).astype(np.float32)
+        runs_needed = state["target"].to_numpy() - state["score"].to_numpy()
+        state["runs_needed"] = runs_needed.astype(np.float32)
+        state["required_run_rate"] = np.where(
+            balls_remaining > 0, np.maximum(runs_needed, 0) / balls_remaining * 6, np.nan
+        ).astype(np.float32)
+
+    codes = np.where(super_over, -1, phase_codes(state["over"].to_numpy()))
+    state["phase"] = pd.Categorical.from_codes(codes, PHASES)
+    return state
+
+
+def innings_totals(state):
+    """Final state of every innings (the last ball of each)."""
+    last_ball = ~state.duplicated(["match_id", "inning"], keep="last")
+    return state.loc[last_ball, [
+        "match_id", "inning", "season", "batting_team", "bowling_team", "score", "wickets", "balls_bowled",
+    ]].reset_index(drop=True)
+
+
+def phase_totals(state):
+    """Runs, balls and wickets per innings and phase (super overs have no phase and are left out)."""
+    match_id = state["match_id"].to_numpy()
+    inning = state["inning"].to_numpy()
+    codes = state["phase"].cat.codes.to_numpy()
+
+    # Each (innings, phase) is a run of consecutive rows; its totals are the
+    # running totals at its last ball less those at the ball before it
+    new_innings = np.r_[True, (match_id[1:] != match_id[:-1]) | (inning[1:] != inning[:-1])]
+    starts = np.flatnonzero(new_innings | np.r_[True, codes[1:] != codes[:-1]])
+    ends = np.r_[starts[1:], len(state)] - 1
+    first = new_innings[starts]
+    regular = inning[starts] <= REGULAR_INNINGS
+    starts, ends, first = starts[regular], ends[regular], first[regular]
+
+    totals = state[["match_id", "inning", "season", "batting_team", "phase"]].iloc[starts].reset_index(drop=True)
+    for column, running in (("runs", "score"), ("wickets", "wickets")):
+        values = state[running].to_numpy(dtype=np.int64)
+        totals[column] = values[ends] - np.where(first, 0, values[starts - 1])
+    totals["balls"] = ends - starts + 1
+    return totals[["match_id", "inning", "season", "batting_team", "phase", "runs", "balls", "wickets"]]
+
+
+def score_progression(state, match_id, inning):
+    """Score and wickets at the end of each over of one innings."""
+    match_ids = state["match_id"].to_numpy()
+    rows = state.iloc[np.searchsorted(match_ids, match_id):np.searchsorted(match_ids, match_id, side="right")]
+    rows = rows[rows["inning"].to_numpy() == inning]
+    over = rows["over"].to_numpy()
+    last_ball = np.r_[over[1:] != over[:-1], True]
+    return rows.loc[last_ball, ["over", "score", "wickets"]].reset_index(drop=True)
+
+
+if __name__ == "__main__":
+    from data_store import load_store
+
+    state = innings_state(*load_store())
+    totals = innings_totals(state)
+    print(f"Innings state of {len(totals):,} innings ({len(state):,} balls).")
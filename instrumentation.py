@@ -0,0 +1,211 @@
+"""Per-rerun timing spans and process-wide counters for the dashboard.
+
+Off unless IPL_INSTRUMENTATION=1 is set, or IPL_ADMIN_TOKEN is set and
+the page is opened with ?admin=<that token>. When off, section() returns
+at once and span() hands back one shared no-op context manager, so
+instrumented code pays a method call.
+
+When on, every rerun records one span per section (wall time, rows
+processed). It emits one log line on stderr, and optionally writes the
+Prometheus text exposition to $IPL_METRICS_FILE for a node_exporter
+textfile collector. The admin sidebar shows the same numbers.
+"""
+import hmac
+import logging
+import os
+import threading
+import time
+from collections import defaultdict
+
+
+logger = logging.getLogger("ipl.instrumentation")
+# Nothing else configures logging under `streamlit run`, so the rerun lines need their own handler
+if not logger.handlers:
+    _handler = logging.StreamHandler()
+    _handler.setFormatter(logging.Formatter("%(asctime)s %(name)s %(message)s"))
+    logger.addHandler(_handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+ENABLED_ENV = "IPL_INSTRUMENTATION"
+ADMIN_TOKEN_ENV = "IPL_ADMIN_TOKEN"
+METRICS_FILE_ENV = "IPL_METRICS_FILE"
+
+
+def instrumentation_enabled(admin=None):
+    """Whether to instrument this session; admin is the ?admin= query parameter, if any."""
+    if os.environ.get(ENABLED_ENV) == "1":
+        return True
+    token = os.environ.get(ADMIN_TOKEN_ENV)
+    if not token or not admin:
+        return False
+    return hmac.compare_digest(admin.encode(), token.encode())
+
+
+class Counters:
+    """Monotonic counters shared by every session of the process."""
+
+    def __init__(self):
+        self._values = defaultdict(float)
+        self._lock = threading.Lock()
+
+    def inc(self, name, value=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._values[key] += value
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self._values)
+
+
+COUNTERS = Counters()
+
+
+class _NullSpan:
+    rows = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Span:
+    __slots__ = ("name", "rows", "seconds", "start")
+
+    def __init__(self, name, rows=None):
+        self.name = name
+        self.rows = rows
+        self.seconds = None
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.seconds = time.perf_counter() - self.start
+        return False
+
+
+class RerunTimer:
+    """Spans of one script run.
+
+    The script marks where each section starts with section(); a section
+    runs until the next one (or finish()), which suits Streamlit's
+    top-to-bottom reruns. span() times a nested block such as a cached
+    loader. Both are no-ops when disabled.
+    """
+
+    def __init__(self, enabled):
+        self.enabled = enabled
+        self.spans = []
+        self.seconds = None
+        self._current = None
+        self.start = time.perf_counter()
+
+    def span(self, name, rows=None):
+        if not self.enabled:
+            return _NULL_SPAN
+        span = Span(name, rows)
+        self.spans.append(span)
+        return span
+
+    def section(self, name):
+        if not self.enabled:
+            return
+        self._close_section()
+        self._current = self.span(name).__enter__()
+
+    def add_rows(self, rows):
+        if self.enabled and self._current is not None:
+            self._current.rows = (self._current.rows or 0) + int(rows)
+
+    def _close_section(self):
+        if self._current is not None:
+            self._current.__exit__(None, None, None)
+            self._current = None
+
+    def finish(self, caches=None):
+        """Close the rerun: fold its spans into the counters, then log and export them.
+
+        caches maps a cache name to its (hits, misses) since process start.
+        """
+        if not self.enabled:
+            return
+        self._close_section()
+        self.seconds = time.perf_counter() - self.start
+        COUNTERS.inc("ipl_reruns_total")
+        for span in self.spans:
+            COUNTERS.inc("ipl_section_seconds_total", span.seconds or 0.0, section=span.name)
+            COUNTERS.inc("ipl_section_calls_total", section=span.name)
+            if span.rows:
+                COUNTERS.inc("ipl_section_rows_total", span.rows, section=span.name)
+
+        logger.info(
+            "rerun %.1fms %s", self.seconds * 1e3,
+            " ".join(f"{span.name}={(span.seconds or 0) * 1e3:.1f}ms" for span in self.spans),
+        )
+        path = os.environ.get(METRICS_FILE_ENV)
+        if path:
+            tmp_path = path + ".tmp"
+            with open(tmp_path, "w") as f:
+                f.write(prometheus_text(self, caches))
+            os.replace(tmp_path, path)
+
+
+def count_cache_call(cache, miss=False):
+    # For st.cache_* loaders: call sites count requests, the body counts misses
+    COUNTERS.inc("ipl_cache_misses_total" if miss else "ipl_cache_requests_total", cache=cache)
+
+
+def _labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{value}"' for name, value in labels) + "}"
+
+
+def prometheus_text(timer=None, caches=None):
+    """Counters, cache stats and the last rerun's spans in Prometheus text format."""
+    lines = []
+    values = COUNTERS.snapshot()
+    for cache, (hits, misses) in (caches or {}).items():
+        values[("ipl_cache_requests_total", (("cache", cache),))] = hits + misses
+        values[("ipl_cache_misses_total", (("cache", cache),))] = misses
+
+    seen = set()
+    for (name, labels), value in sorted(values.items()):
+        if name not in seen:
+            lines.append(f"# TYPE {name} counter")
+            seen.add(name)
+        lines.append(f"{name}{_labels(labels)} {value:g}")
+
+    if timer is not None and timer.seconds is not None:
+        lines.append("# TYPE ipl_rerun_seconds gauge")
+        lines.append(f"ipl_rerun_seconds {timer.seconds:.6f}")
+        lines.append("# TYPE ipl_section_seconds gauge")
+        for span in timer.spans:
+            lines.append(f'ipl_section_seconds{{section="{span.name}"}} {(span.seconds or 0):.6f}')
+        # When each section was on the page, counted from the start of the rerun
+        lines.append("# TYPE ipl_section_finished_seconds gauge")
+        for span in timer.spans:
+            finished = span.start - timer.start + (span.seconds or 0)
+            lines.append(f'ipl_section_finished_seconds{{section="{span.name}"}} {finished:.6f}')
+    return "\n".join(lines) + "\n"
+
+
+def span_table(timer):
+    """The rerun's spans as rows for a table: section, ms, finished at (ms into the rerun), rows."""
+    return [
+        {
+            "section": span.name,
+            "ms": round((span.seconds or 0) * 1e3, 2),
+            "finished_ms": round((span.start - timer.start + (span.seconds or 0)) * 1e3, 1),
+            "rows": span.rows,
+        }
+        for span in timer.spans
+    ]
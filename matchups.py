@@ -0,0 +1,90 @@
+"""Batter-vs-bowler matchups as a sparse matrix on integer player ids."""
+import numpy as np
+import pandas as pd
+
+
+MATCHUP_STATS = ["runs", "balls", "dismissals", "dots", "boundaries"]
+
+
+class MatchupMatrix:
+    """Head-to-head totals for every (batter, bowler) pair that has met.
+
+    Built from the additive base "matchups" table. Players get integer ids
+    (sorted names) and the stats are held in CSR form: the bowlers a batter
+    has faced are a contiguous, sorted slice of `indices`, with the matching
+    rows of `values`. A pair lookup is a dict access, a slice and a binary
+    search over that batter's bowlers. A CSC ordering of the same entries
+    serves the bowler's side.
+    """
+
+    def __init__(self, matchups):
+        self.players = pd.Index(
+            np.union1d(matchups["batter"].astype(str).unique(), matchups["bowler"].astype(str).unique())
+        )
+        self._ids = {name: i for i, name in enumerate(self.players)}
+        batter = self.players.get_indexer(matchups["batter"].astype(str)).astype(np.int32)
+        bowler = self.players.get_indexer(matchups["bowler"].astype(str)).astype(np.int32)
+        values = matchups[MATCHUP_STATS].to_numpy(dtype=np.int32)
+
+        n = len(self.players)
+        order = np.lexsort((bowler, batter))
+        self.indptr = np.zeros(n + 1, dtype=np.int32)
+        np.cumsum(np.bincount(batter, minlength=n), out=self.indptr[1:])
+        self.indices = bowler[order]
+        self.values = values[order]
+
+        # Column access: entry positions ordered by bowler, then batter
+        by_bowler = np.lexsort((batter[order], bowler[order])).astype(np.int32)
+        self._col_indptr = np.zeros(n + 1, dtype=np.int32)
+        np.cumsum(np.bincount(bowler, minlength=n), out=self._col_indptr[1:])
+        self._col_entries = by_bowler
+        self._col_batters = batter[order][by_bowler]
+
+        self.batters = list(self.players[np.diff(self.indptr) > 0])
+        self.bowlers = list(self.players[np.diff(self._col_indptr) > 0])
+
+    @property
+    def nbytes(self):
+        arrays = (self.indptr, self.indices, self.values, self._col_indptr, self._col_entries, self._col_batters)
+        return sum(array.nbytes for array in arrays)
+
+    def _entry(self, batter_id, bowler_id):
+        start, stop = self.indptr[batter_id], self.indptr[batter_id + 1]
+        position = start + self.indices[start:stop].searchsorted(bowler_id)
+        if position < stop and self.indices[position] == bowler_id:
+            return position
+        return None
+
+    def lookup(self, batter, bowler):
+        """Stats of batter against bowler as a dict, or None if they never met."""
+        batter_id, bowler_id = self._ids.get(batter), self._ids.get(bowler)
+        if batter_id is None or bowler_id is None:
+            return None
+        position = self._entry(batter_id, bowler_id)
+        if position is None:
+            return None
+        return dict(zip(MATCHUP_STATS, self.values[position].tolist()))
+
+    def _frame(self, opponents, values, column):
+        frame = pd.DataFrame(values, columns=MATCHUP_STATS)
+        frame.insert(0, column, self.players[opponents])
+        with np.errstate(divide="ignore", invalid="ignore"):
+            frame["strike_rate"] = (frame["runs"] / frame["balls"] * 100).round(2)
+        return frame
+
+    def batter_matchups(self, batter):
+        """Every bowler the batter has faced, or None for an unknown batter."""
+        batter_id = self._ids.get(batter)
+        if batter_id is None:
+            return None
+        start, stop = self.indptr[batter_id], self.indptr[batter_id + 1]
+        return self._frame(self.indices[start:stop], self.values[start:stop], "bowler")
+
+    def bowler_matchups(self, bowler):
+        """Every batter the bowler has bowled to, or None for an unknown bowler."""
+        bowler_id = self._ids.get(bowler)
+        if bowler_id is None:
+            return None
+        start, stop = self._col_indptr[bowler_id], self._col_indptr[bowler_id + 1]
+        entries = self._col_entries[start:stop]
+        return self._frame(self._col_batters[start:stop], self.values[entries], "batter")
@@ -0,0 +1,70 @@
+"""Base aggregates computed across processes, one batch of seasons each.
+
+The store already keeps deliveries partitioned by season in uncompressed
+Arrow files, and a season never splits a match, so every batch of seasons
+yields partial base tables that merge by a grouped sum. Workers are sent
+the store directory and their seasons only: each one memory-maps its own
+partition files, which the OS page cache shares between processes, so no
+frame is ever pickled on the way in. Only the (player-sized) partial tables
+come back.
+
+Set IPL_AGGREGATION_WORKERS (or pass workers) to use it; 0 or 1 keeps the
+serial path.
+"""
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from aggregations import compute_base_aggregates, delivery_aggregates, match_aggregates, merge_base_aggregates
+from data_store import STORE_DIR, Dataset, deliveries_paths
+
+WORKERS_ENV = "IPL_AGGREGATION_WORKERS"
+# Batches per worker: enough to even out uneven seasons, few enough that
+# the fixed cost of each batch (string keys, partnerships setup) stays small
+BATCHES_PER_WORKER = 2
+
+
+def configured_workers():
+    return int(os.environ.get(WORKERS_ENV) or 0)
+
+
+def season_batches(dataset, n_batches):
+    """Split the seasons into up to n_batches groups of about equal size on disk."""
+    sizes = {}
+    for season, path in deliveries_paths(dataset.store_dir, dataset.partitions):
+        sizes[season] = sizes.get(season, 0) + os.path.getsize(path)
+
+    # Largest first onto the currently smallest batch
+    batches = [[] for _ in range(min(n_batches, len(sizes)))]
+    totals = [0] * len(batches)
+    for season in sorted(sizes, key=sizes.get, reverse=True):
+        smallest = totals.index(min(totals))
+        batches[smallest].append(season)
+        totals[smallest] += sizes[season]
+    # Biggest batches go to the pool first
+    order = sorted(range(len(batches)), key=totals.__getitem__, reverse=True)
+    return [sorted(batches[i]) for i in order]
+
+
+def _batch_aggregates(store_dir, seasons):
+    return delivery_aggregates(Dataset(store_dir).deliveries(seasons=seasons))
+
+
+def parallel_base_aggregates(store_dir=STORE_DIR, workers=None):
+    """compute_base_aggregates() over the stored dataset, across workers processes."""
+    workers = workers or configured_workers()
+    dataset = Dataset(store_dir)
+    if workers <= 1:
+        return compute_base_aggregates(dataset.matches(), dataset.deliveries())
+
+    batches = season_batches(dataset, workers * BATCHES_PER_WORKER)
+    # Not fork: the dashboard calls this from a thread of a multithreaded server
+    context = multiprocessing.get_context("forkserver")
+    # Workers fork from a server that has already imported pandas and pyarrow
+    context.set_forkserver_preload(["aggregations", "data_store"])
+    with ProcessPoolExecutor(workers, mp_context=context) as pool:
+        partials = list(pool.map(_batch_aggregates, [store_dir] * len(batches), batches))
+
+    base = merge_base_aggregates(*partials)
+    base.update(match_aggregates(dataset.matches()))
+    return base
@@ -0,0 +1,143 @@
+"""Partnerships, segmented by the wickets that end them.
+
+Deliveries are put in ball order and every innings is cut into segments at
+each wicket (and whenever the pair at the crease changes without one, e.g.
+a batter retiring). A segment is one partnership; the pair is unordered and
+its runs include extras. Segments are contiguous after the sort, so their
+totals come from np.add.reduceat instead of a groupby, and pair totals
+from np.bincount over the pair codes.
+"""
+import numpy as np
+import pandas as pd
+
+
+def _codes(series, players):
+    # Categoricals are mapped through their (few) categories, not every row
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        lookup = players.get_indexer(series.cat.categories.astype(str))
+        return lookup[series.cat.codes.to_numpy()]
+    return players.get_indexer(series.astype(str))
+
+
+def _labels(series):
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series.cat.categories.astype(str)
+    return series.astype(str).unique()
+
+
+def _player_codes(deliveries):
+    # One code space for both ends, so A & B and B & A get the same pair
+    batter, non_striker = deliveries["batter"], deliveries["non_striker"]
+    if (
+        isinstance(batter.dtype, pd.CategoricalDtype)
+        and isinstance(non_striker.dtype, pd.CategoricalDtype)
+        and batter.cat.categories.equals(non_striker.cat.categories)
+        and batter.cat.categories.is_monotonic_increasing
+    ):
+        return batter.cat.categories.astype(str), batter.cat.codes.to_numpy(), non_striker.cat.codes.to_numpy()
+    players = pd.Index(np.union1d(_labels(batter), _labels(non_striker)))
+    return players, _codes(batter, players), _codes(non_striker, players)
+
+
+def partnership_segments(deliveries):
+    """One row per partnership: match, innings, wicket it was for, pair, runs, balls."""
+    n = len(deliveries)
+    if n == 0:
+        return pd.DataFrame(columns=[
+            "match_id", "inning", "season", "wicket", "player_1", "player_2",
+            "runs", "batsman_runs", "balls", "ended_by_wicket",
+        ])
+
+    # Segments only need every match to be contiguous and in ball order
+    # within it. The stored season partitions already are, in which case the
+    # sort is skipped: the balls of each match are in order, and no match
+    # starts twice (a check over the match starts, not every row).
+    match_id = deliveries["match_id"].to_numpy()
+    key = (
+        deliveries["inning"].to_numpy(dtype=np.int32) << 16
+        | deliveries["over"].to_numpy(dtype=np.int32) << 8
+        | deliveries["ball"].to_numpy(dtype=np.int32)
+    )
+    new_match = match_id[1:] != match_id[:-1]
+    in_order = np.all(new_match | (key[1:] >= key[:-1]))
+    if in_order:
+        match_starts = match_id[np.r_[0, np.flatnonzero(new_match) + 1]]
+        in_order = len(np.unique(match_starts)) == len(match_starts)
+    order = None if in_order else np.lexsort((key, match_id))
+
+    def column(name, dtype=None):
+        values = deliveries[name].to_numpy(dtype=dtype)
+        return values if order is None else values[order]
+
+    match_id = column("match_id")
+    inning = column("inning")
+    wickets = column("is_wicket", np.int8)
+
+    new_innings = np.ones(n, dtype=bool)
+    new_innings[1:] = (match_id[1:] != match_id[:-1]) | (inning[1:] != inning[:-1])
+
+    players, batter, non_striker = _player_codes(deliveries)
+    if order is not None:
+        batter, non_striker = batter[order], non_striker[order]
+    player_1 = np.minimum(batter, non_striker)
+    player_2 = np.maximum(batter, non_striker)
+
+    # A partnership ends on the ball a wicket falls on, at the end of the
+    # innings, or when the pair changes without a wicket
+    boundary = new_innings.copy()
+    boundary[1:] |= (wickets[:-1] > 0) | (player_1[1:] != player_1[:-1]) | (player_2[1:] != player_2[:-1])
+    starts = np.flatnonzero(boundary)
+    ends = np.append(starts[1:], n) - 1
+
+    # Wickets fallen before each partnership, counted within its innings
+    ended_by_wicket = wickets[ends] > 0
+    fallen = np.cumsum(ended_by_wicket) - ended_by_wicket
+    first = new_innings[starts]
+    fallen -= fallen[first][np.cumsum(first) - 1]
+
+    segments = pd.DataFrame({
+        "match_id": match_id[starts],
+        "inning": inning[starts],
+        "season": column("season")[starts],
+        "wicket": fallen + 1,
+        "player_1": pd.Categorical.from_codes(player_1[starts], players),
+        "player_2": pd.Categorical.from_codes(player_2[starts], players),
+        "runs": np.add.reduceat(column("total_runs", np.int32), starts),
+        "batsman_runs": np.add.reduceat(column("batsman_runs", np.int32), starts),
+        "balls": ends - starts + 1,
+        "ended_by_wicket": ended_by_wicket,
+    })
+    return segments
+
+
+def pair_totals(segments):
+    """Career totals per unordered pair; every column is additive."""
+    player_1, player_2 = segments["player_1"], segments["player_2"]
+    if not (
+        isinstance(player_1.dtype, pd.CategoricalDtype)
+        and isinstance(player_2.dtype, pd.CategoricalDtype)
+        and player_1.cat.categories.equals(player_2.cat.categories)
+    ):
+        # Pair tables of several sources: fall back to the groupby
+        pairs = segments.groupby(["player_1", "player_2"], observed=True, sort=True).agg(
+            runs=pd.NamedAgg(column="runs", aggfunc="sum"),
+            batsman_runs=pd.NamedAgg(column="batsman_runs", aggfunc="sum"),
+            balls=pd.NamedAgg(column="balls", aggfunc="sum"),
+            partnerships=pd.NamedAgg(column="runs", aggfunc="count"),
+        ).reset_index()
+        for column in ("player_1", "player_2"):
+            pairs[column] = pairs[column].astype(str)
+        return pairs
+
+    # One integer per pair, sorted like the player names (the categories are)
+    players = player_1.cat.categories.astype(str)
+    pair = player_1.cat.codes.to_numpy(dtype=np.int64) * len(players) + player_2.cat.codes.to_numpy(dtype=np.int64)
+    keys, inverse = np.unique(pair, return_inverse=True)
+    pairs = pd.DataFrame({
+        "player_1": players[keys // len(players)],
+        "player_2": players[keys % len(players)],
+    })
+    for column in ("runs", "batsman_runs", "balls"):
+        pairs[column] = np.bincount(inverse, weights=segments[column].to_numpy(), minlength=len(keys)).astype(np.int64)
+    pairs["partnerships"] = np.bincount(inverse, minlength=len(keys))
+    return pairs
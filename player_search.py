@@ -0,0 +1,122 @@
+"""Ranked, case-insensitive player-name search for the player picker.
+
+The name table (every player with their career balls faced plus bowled)
+and the NameIndex built from it are materialized with the other
+aggregates of a dataset version, so a worker loads the index instead of
+rebuilding it. Names are kept sorted by career balls, and every n-gram of
+every name maps to the (sorted) positions of the names containing it, so
+matches come out best first: a lookup takes the shortest posting lists
+and stops as soon as it has enough names.
+Matches at the start of the name come first, then at the start of a word
+("kohli" finds "V Kohli"), then anywhere.
+"""
+import numpy as np
+import pandas as pd
+
+# Longest indexed n-gram; longer queries are narrowed by their n-grams, then checked
+MAX_GRAM = 3
+SUGGESTIONS = 20
+# Candidates of a long query are checked this many at a time
+CHECK_BLOCK = 256
+# Never part of a name; prefixed to every indexed name
+NAME_START = "\x02"
+_NO_ROWS = np.empty(0, dtype=np.int64)
+
+
+def name_table(player_balls):
+    """One row per player with their career balls, from (player, balls) rows."""
+    names = player_balls.groupby("player", observed=True)["balls"].sum().reset_index()
+    names["player"] = names["player"].astype(str)
+    names["balls"] = names["balls"].astype("int64")
+    return names.sort_values("player", ignore_index=True)
+
+
+def name_table_from_base(base):
+    """The name table and its NameIndex tables, as stored in the player_names aggregate."""
+    names = name_table(pd.concat([
+        base["batter_season"][["batter", "balls"]].rename(columns={"batter": "player"}),
+        base["bowler_season"][["bowler", "balls"]].rename(columns={"bowler": "player"}),
+    ], ignore_index=True))
+    return {"names": names, **NameIndex(names).tables()}
+
+
+def _grams(text, n):
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+class NameIndex:
+    """Top-N player suggestions for a typed query, in well under a millisecond."""
+
+    def __init__(self, names):
+        keys = np.array([name.casefold() for name in names["player"]], dtype=object)
+        # Rows are numbered most balls first (ties by name), so every posting list is ranked
+        order = np.lexsort((keys, -names["balls"].to_numpy()))
+        self._set_names(names["player"].to_numpy(dtype=object)[order])
+
+        postings = {}
+        for row, text in enumerate(self._texts):
+            for n in range(1, MAX_GRAM + 1):
+                for gram in _grams(text, n):
+                    postings.setdefault(gram, []).append(row)
+        self._postings = {gram: np.array(rows, dtype=np.int64) for gram, rows in postings.items()}
+
+    def _set_names(self, ranked):
+        self.names = ranked
+        # NAME_START marks the start of the name, a space the start of any word
+        self._texts = [NAME_START + " " + name.casefold() for name in ranked]
+
+    def tables(self):
+        """The index as frames: ranked names, n-grams with the end of their postings, and the postings."""
+        grams = sorted(self._postings)
+        postings = [self._postings[gram] for gram in grams]
+        return {
+            "ranked_names": pd.DataFrame({"player": self.names.astype(str)}),
+            "grams": pd.DataFrame({"gram": grams, "end": np.cumsum([len(rows) for rows in postings])}),
+            "postings": pd.DataFrame({"row": np.concatenate(postings) if postings else _NO_ROWS}),
+        }
+
+    @classmethod
+    def from_tables(cls, tables):
+        """The index stored by tables(), without re-extracting any n-gram."""
+        index = cls.__new__(cls)
+        index._set_names(tables["ranked_names"]["player"].to_numpy(dtype=object))
+        grams = tables["grams"]
+        rows = tables["postings"]["row"].to_numpy(dtype=np.int64)
+        index._postings = dict(zip(grams["gram"].tolist(), np.split(rows, grams["end"].to_numpy()[:-1])))
+        return index
+
+    def _matches(self, pattern, exclude, limit):
+        # Up to limit rows containing pattern and not in exclude, best first
+        postings = sorted(
+            (self._postings.get(gram, _NO_ROWS) for gram in _grams(pattern, min(len(pattern), MAX_GRAM))), key=len
+        )
+        rows = postings[0]
+        for posting in postings[1:]:
+            # Binary search of the shorter list in the longer one, so the cost follows the shortest
+            positions = np.minimum(np.searchsorted(posting, rows), len(posting) - 1)
+            rows = rows[posting[positions] == rows]
+        if exclude:
+            rows = rows[~np.isin(rows, exclude)]
+        if len(pattern) <= MAX_GRAM:
+            return rows[:limit].tolist()
+
+        # Longer patterns: the n-grams only narrow it down, so check names until there are enough
+        found = []
+        for start in range(0, len(rows), CHECK_BLOCK):
+            found += [row for row in rows[start:start + CHECK_BLOCK].tolist() if pattern in self._texts[row]]
+            if len(found) >= limit:
+                break
+        return found[:limit]
+
+    def search(self, query, n=SUGGESTIONS):
+        """Up to n player names matching query, best first; the most-played players for an empty query."""
+        query = " ".join(query.casefold().split())
+        if not query:
+            return self.names[:n].tolist()
+
+        found = []
+        for pattern in (NAME_START + " " + query, " " + query, query):
+            found += self._matches(pattern, found, n - len(found))
+            if len(found) == n:
+                break
+        return self.names[found].tolist()
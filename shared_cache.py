@@ -0,0 +1,99 @@
+"""Host-wide cache of frames shared by every dashboard worker process.
+
+st.cache_data is per process and hands out a pickled copy on every access.
+Here each frame set is written once per host and dataset version as
+uncompressed Arrow IPC under a shared-memory (tmpfs) directory; every worker
+memory-maps the same files, so the page cache holds a single copy.
+
+    <root>/<version>/<name>/<table>.arrow
+
+The root is $IPL_SHARED_CACHE, else /dev/shm/ipl_cache where /dev/shm
+exists, else a directory under the system temp dir.
+"""
+import os
+import shutil
+import tempfile
+import threading
+
+import pyarrow.feather as feather
+
+from data_store import file_lock, write_table
+
+
+def default_root():
+    if os.environ.get("IPL_SHARED_CACHE"):
+        return os.environ["IPL_SHARED_CACHE"]
+    if os.path.isdir("/dev/shm"):
+        return "/dev/shm/ipl_cache"
+    return os.path.join(tempfile.gettempdir(), "ipl_cache")
+
+
+def _read_shared(path):
+    table = feather.read_table(path, memory_map=True)
+    # One block per column lets numeric columns stay views on the mapping
+    return table.to_pandas(split_blocks=True)
+
+
+class SharedCache:
+
+    def __init__(self, root=None):
+        self.root = root or default_root()
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def _count(self, hit):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def _dir(self, version, name):
+        return os.path.join(self.root, version, name)
+
+    def get_frames(self, version, name, compute):
+        """Frames stored under name for version; compute() -> dict of DataFrames runs once per host."""
+        frames = self._read(version, name)
+        self._count(frames is not None)
+        if frames is not None:
+            return frames
+
+        with file_lock(os.path.join(self.root, version, f".{name}.lock")):
+            # Another worker may have finished while we waited for the lock
+            frames = self._read(version, name)
+            if frames is not None:
+                return frames
+
+            frames = compute()
+            tmp_dir = self._dir(version, name) + ".tmp"
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            os.makedirs(tmp_dir)
+            for table, frame in frames.items():
+                write_table(frame, os.path.join(tmp_dir, table + ".arrow"))
+            # Publish all tables at once
+            os.replace(tmp_dir, self._dir(version, name))
+
+        return self._read(version, name)
+
+    def _read(self, version, name):
+        directory = self._dir(version, name)
+        if not os.path.isdir(directory):
+            return None
+        return {
+            entry[:-len(".arrow")]: _read_shared(os.path.join(directory, entry))
+            for entry in sorted(os.listdir(directory))
+            if entry.endswith(".arrow")
+        }
+
+    def invalidate(self, keep=None):
+        """Drop every cached version except keep.
+
+        Workers still mapping an old version keep working: on Linux an
+        unlinked file stays readable until its last mapping goes away.
+        """
+        if not os.path.isdir(self.root):
+            return
+        for version in os.listdir(self.root):
+            if version != keep:
+                shutil.rmtree(os.path.join(self.root, version), ignore_errors=True)
@@ -0,0 +1,292 @@
+"""Approximate leaderboards and distinct counts in bounded memory.
+
+    python sketches.py --chunksize 500000
+
+For datasets too large for exact groupbys over every player. Each sketch
+has a fixed size, is updated from a whole batch of balls at once and merges
+with a sketch of another batch (chunk, partition, league), so they combine
+like the base aggregates do.
+
+Error bounds, for a stream of total weight N (balls, runs, wickets):
+
+    SpaceSaving(capacity)   every estimate is at least the true count and at
+                            most its recorded error above it; errors are at
+                            most about N / capacity, and any key heavier than
+                            that is among the candidates.
+    CountMin(width, depth)  never underestimates; overestimates by more than
+                            e / width * N with probability below exp(-depth).
+                            The width is a power of two.
+    HyperLogLog(p)          relative standard error 1.04 / sqrt(2 ** p), e.g.
+                            1.6% at p=12 in 4 KiB.
+
+Top-K boards take Space-Saving's candidates and rank them by the smaller of
+the two overestimates.
+"""
+import argparse
+import math
+
+import numpy as np
+import pandas as pd
+
+from aggregations import DEATH_WICKETS, RUNS, SIXES, WICKETS, metric_columns
+from data_store import (
+    DELIVERIES_CSV, MATCHES_CSV, MATCHES_DTYPES, prepare_deliveries, prepare_matches, read_typed_csv, season_by_match,
+)
+from streaming import CHUNKSIZE, match_chunks
+from teams import display_name_mapping, load_teams
+
+HASH_KEY = "ipl-sketch-hash0"  # 16 bytes, fixed so sketches built anywhere merge
+
+
+def hash_keys(keys):
+    """Stable 64-bit hashes of an array of keys."""
+    return pd.util.hash_array(np.asarray(keys, dtype=object), hash_key=HASH_KEY)
+
+
+class SpaceSaving:
+    """Heavy hitters: the capacity keys with the largest (over)estimated totals."""
+
+    def __init__(self, capacity, counts=None, errors=None, floor=0):
+        self.capacity = capacity
+        self.counts = counts if counts is not None else pd.Series(dtype="int64")
+        self.errors = errors if errors is not None else pd.Series(dtype="int64")
+        # Upper bound on the total of any key that is not kept
+        self.floor = floor
+
+    @classmethod
+    def from_totals(cls, totals, capacity):
+        """Summary of exact per-key totals (a Series indexed by key)."""
+        totals = totals[totals > 0].sort_values(ascending=False, kind="stable")
+        kept = totals.iloc[:capacity]
+        floor = int(totals.iloc[capacity]) if len(totals) > capacity else 0
+        return cls(capacity, kept, pd.Series(0, index=kept.index, dtype="int64"), floor)
+
+    def update(self, keys, weights):
+        totals = pd.Series(np.asarray(weights, dtype=np.int64)).groupby(np.asarray(keys, dtype=object)).sum()
+        return self.merge(SpaceSaving.from_totals(totals, self.capacity))
+
+    def merge(self, other):
+        """Combined summary of two disjoint streams."""
+        # A key missing from one summary may have had up to that summary's floor there
+        both = pd.concat([self.counts, other.counts], axis=1, keys=[0, 1])
+        counts = both[0].fillna(self.floor) + both[1].fillna(other.floor)
+        errors = (
+            self.errors.reindex(both.index).fillna(self.floor)
+            + other.errors.reindex(both.index).fillna(other.floor)
+        )
+        counts = counts.astype("int64").sort_values(ascending=False, kind="stable")
+        kept = counts.iloc[:self.capacity]
+        floor = self.floor + other.floor
+        if len(counts) > self.capacity:
+            floor = max(floor, int(counts.iloc[self.capacity]))
+        return SpaceSaving(self.capacity, kept, errors[kept.index].astype("int64"), floor)
+
+    def top(self, n):
+        """(key, estimate, error) of the n largest estimates, as a frame."""
+        top = self.counts.iloc[:n]
+        return pd.DataFrame({"key": top.index, "estimate": top.to_numpy(), "error": self.errors[top.index].to_numpy()})
+
+
+class CountMin:
+    """Frequency estimates for any key from a depth x width table of counters."""
+
+    def __init__(self, width=2048, depth=5, seed=0):
+        if width < 2 or width & (width - 1):
+            raise ValueError("Count-Min width must be a power of two")
+        self.width = width
+        self.depth = depth
+        self.seed = seed
+        self.table = np.zeros((depth, width), dtype=np.int64)
+        rng = np.random.default_rng(seed)
+        # Multiply-shift hashing of the 64-bit key hashes: one odd multiplier
+        # per row, and the top log2(width) bits of the product as the column
+        self._multipliers = rng.integers(1, 2**63, size=depth, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+        self._shift = np.uint64(64 - (width.bit_length() - 1))
+
+    @classmethod
+    def for_error(cls, epsilon, delta, seed=0):
+        """Overestimate by at most epsilon * N with probability 1 - delta."""
+        return cls(2 ** math.ceil(math.log2(math.e / epsilon)), math.ceil(math.log(1 / delta)), seed)
+
+    def _columns(self, hashes):
+        # The low bits of the product only permute the low bits of the hash,
+        # so every row would collide on the same keys; the high bits mix all of them
+        with np.errstate(over="ignore"):
+            return [(hashes * multiplier) >> self._shift for multiplier in self._multipliers]
+
+    def update(self, keys, weights):
+        weights = np.asarray(weights, dtype=np.int64)
+        for row, columns in enumerate(self._columns(hash_keys(keys))):
+            self.table[row] += np.bincount(columns.astype(np.int64), weights=weights, minlength=self.width).astype(np.int64)
+        return self
+
+    def merge(self, other):
+        if (self.width, self.depth, self.seed) != (other.width, other.depth, other.seed):
+            raise ValueError("Count-Min sketches of different shapes or seeds do not merge")
+        merged = CountMin(self.width, self.depth, self.seed)
+        merged.table = self.table + other.table
+        return merged
+
+    def estimate(self, keys):
+        columns = self._columns(hash_keys(keys))
+        return np.min([self.table[row, column.astype(np.int64)] for row, column in enumerate(columns)], axis=0)
+
+
+class HyperLogLog:
+    """Distinct count of a stream of keys in 2**p one-byte registers."""
+
+    def __init__(self, p=12, registers=None):
+        self.p = p
+        self.registers = registers if registers is not None else np.zeros(2**p, dtype=np.uint8)
+
+    @staticmethod
+    def register_ranks(hashes, p):
+        """(register, rank) of every hash: the first p bits pick the register, the rank is
+        one plus the number of leading zeros in the remaining bits."""
+        registers = (hashes >> np.uint64(64 - p)).astype(np.int64)
+        # A set bit past the remaining bits caps the rank at 64 - p + 1
+        rest = (hashes << np.uint64(p)) | np.uint64(1 << (p - 1))
+        high = (rest >> np.uint64(32)).astype(np.float64)
+        low = (rest & np.uint64(0xFFFFFFFF)).astype(np.float64)
+        # floor(log2) is exact on 32-bit halves
+        with np.errstate(divide="ignore"):
+            leading = np.where(high > 0, 31 - np.floor(np.log2(high)), 63 - np.floor(np.log2(low)))
+        return registers, (leading + 1).astype(np.uint8)
+
+    def update(self, keys):
+        registers, ranks = self.register_ranks(hash_keys(keys), self.p)
+        np.maximum.at(self.registers, registers, ranks)
+        return self
+
+    def merge(self, other):
+        if self.p != other.p:
+            raise ValueError("HyperLogLogs of different precision do not merge")
+        return HyperLogLog(self.p, np.maximum(self.registers, other.registers))
+
+    def count(self):
+        m = 2**self.p
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.exp2(-self.registers.astype(np.float64)))
+        empty = np.count_nonzero(self.registers == 0)
+        # Small cardinalities: linear counting on the empty registers
+        if estimate <= 2.5 * m and empty:
+            estimate = m * math.log(m / empty)
+        return int(round(estimate))
+
+
+def distinct_by_group(groups, keys, p=12):
+    """HyperLogLog of keys per group (both arrays of equal length), as {group: sketch}."""
+    registers, ranks = HyperLogLog.register_ranks(hash_keys(keys), p)
+    frame = pd.DataFrame({"group": np.asarray(groups, dtype=object), "register": registers, "rank": ranks})
+    best = frame.groupby(["group", "register"], sort=False)["rank"].max()
+    sketches = {}
+    for group, group_best in best.groupby(level="group", sort=False):
+        sketch = HyperLogLog(p)
+        sketch.registers[group_best.index.get_level_values("register")] = group_best.to_numpy()
+        sketches[group] = sketch
+    return sketches
+
+
+def merge_distinct(left, right):
+    merged = dict(left)
+    for group, sketch in right.items():
+        merged[group] = merged[group].merge(sketch) if group in merged else sketch
+    return merged
+
+
+# Top-K boards: (output key column, value column, metric, grouping column)
+SKETCH_BOARDS = {
+    "top_batsmen": ("batter", "batsman_runs", RUNS, "batter"),
+    "most_sixes": ("batter", "sixes", SIXES, "batter"),
+    "top_bowlers": ("bowler", "wickets", WICKETS, "bowler"),
+    "death_bowlers": ("bowler", "wickets", DEATH_WICKETS, "bowler"),
+}
+
+
+def leaderboard_sketches(deliveries, matches=None, capacity=200, width=2048, depth=5, p=12):
+    """Sketches of one batch of deliveries (and optionally its matches), mergeable with merge_sketches()."""
+    values = metric_columns(deliveries, [metric for _, _, metric, _ in SKETCH_BOARDS.values()])
+    # Sketching (key, batch total) pairs gives the same sketch as sketching
+    # every ball, so only the batch's distinct players are hashed
+    sketches = {}
+    for board, (_, _, metric, column) in SKETCH_BOARDS.items():
+        totals = values[metric.name].groupby(deliveries[column], observed=True).sum()
+        sketches[board] = _top_k_sketches(totals, capacity, width, depth)
+    if matches is not None:
+        awards = matches["player_of_match"].value_counts()
+        sketches["impactful_players"] = _top_k_sketches(awards, capacity, width, depth)
+
+    # Everyone who batted or bowled for a team in a season, like the squad search
+    sides = pd.concat([
+        pd.DataFrame({"team": deliveries["batting_team"], "season": deliveries["season"], "player": deliveries["batter"]}),
+        pd.DataFrame({"team": deliveries["bowling_team"], "season": deliveries["season"], "player": deliveries["bowler"]}),
+    ]).drop_duplicates()
+    groups = pd.MultiIndex.from_arrays([sides["team"].astype(str), sides["season"]]).to_numpy()
+    sketches["squad_sizes"] = distinct_by_group(groups, sides["player"].astype(str).to_numpy(), p)
+    return sketches
+
+
+def _top_k_sketches(totals, capacity, width, depth):
+    keys = totals.index.astype(str).to_numpy(dtype=object)
+    weights = totals.to_numpy(dtype=np.int64)
+    return SpaceSaving(capacity).update(keys, weights), CountMin(width, depth).update(keys, weights)
+
+
+def merge_sketches(left, right):
+    merged = {}
+    for name, sketch in left.items():
+        if name == "squad_sizes":
+            merged[name] = merge_distinct(sketch, right[name])
+        elif name in right:
+            merged[name] = (sketch[0].merge(right[name][0]), sketch[1].merge(right[name][1]))
+        else:
+            merged[name] = sketch
+    return merged
+
+
+def sketch_leaderboards(sketches, n=10):
+    """Approximate boards shaped like leaderboards_from_base(), plus estimated squad sizes."""
+    columns = dict(SKETCH_BOARDS, impactful_players=("player", "awards", None, None))
+    boards = {}
+    for board, (space_saving, count_min) in ((b, s) for b, s in sketches.items() if b != "squad_sizes"):
+        key_column, value_column = columns[board][:2]
+        candidates = space_saving.counts
+        # Both overestimate, so the smaller is the better estimate
+        estimates = np.minimum(candidates.to_numpy(), count_min.estimate(candidates.index.to_numpy()))
+        board_frame = pd.DataFrame({key_column: candidates.index.astype(str), value_column: estimates})
+        board_frame = board_frame.sort_values(value_column, ascending=False, kind="stable").head(n)
+        boards[board] = board_frame.reset_index(drop=True)
+
+    boards["squad_sizes"] = pd.DataFrame(
+        [(team, season, sketch.count()) for (team, season), sketch in sketches["squad_sizes"].items()],
+        columns=["team", "season", "players"],
+    ).sort_values(["team", "season"], ignore_index=True)
+    return boards
+
+
+def stream_sketches(matches_csv=MATCHES_CSV, deliveries_csv=DELIVERIES_CSV, chunksize=CHUNKSIZE, capacity=200):
+    """Leaderboard sketches of the two CSVs, one chunk of deliveries in memory at a time."""
+    team_names = display_name_mapping(load_teams())
+    matches = prepare_matches(read_typed_csv(matches_csv, MATCHES_DTYPES), team_names)
+    seasons = season_by_match(matches)
+
+    sketches = leaderboard_sketches(
+        prepare_deliveries(pd.read_csv(deliveries_csv, nrows=0), seasons, team_names), matches, capacity
+    )
+    for chunk in match_chunks(deliveries_csv, chunksize):
+        chunk = prepare_deliveries(chunk, seasons, team_names)
+        sketches = merge_sketches(sketches, leaderboard_sketches(chunk, capacity=capacity))
+    return sketches
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Approximate leaderboards from a stream of deliveries.")
+    parser.add_argument("--matches", default=MATCHES_CSV)
+    parser.add_argument("--deliveries", default=DELIVERIES_CSV)
+    parser.add_argument("--chunksize", type=int, default=CHUNKSIZE)
+    parser.add_argument("--capacity", type=int, default=200)
+    args = parser.parse_args()
+
+    sketches = stream_sketches(args.matches, args.deliveries, args.chunksize, args.capacity)
+    for board, frame in sketch_leaderboards(sketches).items():
+        print(f"\n{board}\n{frame.head(10).to_string(index=False)}")
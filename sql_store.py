@@ -0,0 +1,268 @@
+"""Embedded SQLite backend for the dashboard queries.
+
+Build (or refresh) the database next to the columnar store with:
+
+    python sql_store.py
+
+The database is bulk-loaded from the store, one season partition at a
+time, and rebuilt only when the dataset version changes. Player, squad,
+matchup and leaderboard queries run as indexed SQL instead of filtering
+frames in pandas. Set IPL_BACKEND=sqlite to have the dashboard use it.
+
+Partnerships need the ball order of every innings, which does not map onto
+a GROUP BY, so their per-pair totals are loaded as a derived table.
+"""
+import os
+import sqlite3
+import threading
+
+import pandas as pd
+
+from aggregations import BOWLER_WICKET_KINDS, DEATH_OVERS
+from data_store import STORE_DIR, Dataset, dataset_version, file_lock
+from partnerships import pair_totals, partnership_segments
+
+SQL_DB = "ipl.sqlite"
+BACKEND_ENV = "IPL_BACKEND"
+
+SCHEMA = """
+CREATE TABLE meta (version TEXT NOT NULL);
+CREATE TABLE matches (
+    id INTEGER PRIMARY KEY, season INTEGER, city TEXT, date TEXT, match_type TEXT,
+    player_of_match TEXT, venue TEXT, team1 TEXT, team2 TEXT, toss_winner TEXT,
+    toss_decision TEXT, winner TEXT, result TEXT, result_margin INTEGER,
+    target_runs REAL, target_overs REAL, super_over TEXT
+);
+CREATE TABLE deliveries (
+    match_id INTEGER, inning INTEGER, batting_team TEXT, bowling_team TEXT,
+    over INTEGER, ball INTEGER, batter TEXT, bowler TEXT, non_striker TEXT,
+    batsman_runs INTEGER, extra_runs INTEGER, total_runs INTEGER, is_wicket INTEGER,
+    player_dismissed TEXT, dismissal_kind TEXT, season INTEGER
+);
+CREATE TABLE pairs (
+    player_1 TEXT, player_2 TEXT, runs INTEGER, batsman_runs INTEGER, balls INTEGER, partnerships INTEGER
+);
+"""
+
+# Created after the bulk load. The player indexes cover their summaries,
+# so those queries never touch the table itself.
+INDEXES = """
+CREATE INDEX deliveries_match ON deliveries (match_id, inning);
+CREATE INDEX deliveries_batter ON deliveries (batter, season, match_id, batsman_runs);
+CREATE INDEX deliveries_bowler ON deliveries (bowler, season, dismissal_kind);
+CREATE INDEX deliveries_season ON deliveries (season, batting_team, bowling_team);
+CREATE INDEX matches_season ON matches (season);
+"""
+
+
+def sql_path(store_dir=STORE_DIR):
+    return os.path.join(store_dir, SQL_DB)
+
+
+def _stored_version(path):
+    try:
+        with sqlite3.connect(f"file:{path}?mode=ro", uri=True) as conn:
+            return conn.execute("SELECT version FROM meta").fetchone()[0]
+    except sqlite3.Error:
+        return None
+
+
+def _insert(conn, table, frame):
+    # Categoricals and NaN become plain Python values (NULL for missing)
+    columns = [
+        frame[column].astype(object).where(frame[column].notna(), None).tolist()
+        for column in frame.columns
+    ]
+    placeholders = ", ".join("?" * len(columns))
+    conn.executemany(
+        f"INSERT INTO {table} ({', '.join(frame.columns)}) VALUES ({placeholders})", zip(*columns)
+    )
+
+
+def build_sql_store(store_dir=STORE_DIR):
+    """Bulk-load the current dataset into a fresh database and swap it in."""
+    dataset = Dataset(store_dir)
+    path = sql_path(store_dir)
+    tmp_path = path + ".tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+
+    conn = sqlite3.connect(tmp_path)
+    try:
+        # A crashed load only leaves a .tmp file behind, so nothing needs to be durable until the swap
+        conn.execute("PRAGMA journal_mode = OFF")
+        conn.execute("PRAGMA synchronous = OFF")
+        conn.executescript(SCHEMA)
+        with conn:
+            _insert(conn, "matches", dataset.matches())
+            for season in dataset.seasons:
+                deliveries = dataset.deliveries(seasons=[season])
+                _insert(conn, "deliveries", deliveries)
+                # A season never splits an innings, so pair totals add up across seasons
+                _insert(conn, "pairs", pair_totals(partnership_segments(deliveries)))
+            conn.execute("INSERT INTO meta VALUES (?)", (dataset.version,))
+        conn.executescript(INDEXES)
+        conn.execute("ANALYZE")
+    finally:
+        conn.close()
+    os.replace(tmp_path, path)
+    return path
+
+
+def open_sql_backend(store_dir=STORE_DIR):
+    """SqlBackend on the database of the current dataset version, (re)building it if needed."""
+    version = dataset_version(store_dir=store_dir)
+    path = sql_path(store_dir)
+    if _stored_version(path) != version:
+        with file_lock(os.path.join(store_dir, ".sql.lock")):
+            if _stored_version(path) != version:
+                build_sql_store(store_dir)
+    return SqlBackend(path)
+
+
+def _in_list(values):
+    return "(" + ", ".join("'" + value.replace("'", "''") + "'" for value in values) + ")"
+
+
+# Bowler wickets as a per-row 0/1 expression (dismissal_kind is NULL on most balls)
+_WICKET = f"COALESCE(dismissal_kind IN {_in_list(BOWLER_WICKET_KINDS)}, 0)"
+
+
+class SqlBackend:
+    """Read-only queries against the SQLite database, one connection per thread.
+
+    batting_summary(), bowling_summary() and players follow PlayerIndex, and
+    leaderboards() follows leaderboards_from_base(), so either can back the
+    dashboard.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        self._players = None
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True, check_same_thread=False)
+            self._local.conn = conn
+        return conn
+
+    def query(self, sql, params=()):
+        cursor = self._conn().execute(sql, params)
+        columns = [description[0] for description in cursor.description]
+        return pd.DataFrame.from_records(cursor.fetchall(), columns=columns)
+
+    def matches(self):
+        return self.query("SELECT * FROM matches ORDER BY id")
+
+    @property
+    def players(self):
+        if self._players is None:
+            rows = self._conn().execute(
+                "SELECT DISTINCT batter FROM deliveries UNION SELECT DISTINCT bowler FROM deliveries"
+            ).fetchall()
+            self._players = sorted(row[0] for row in rows if row[0] is not None)
+        return self._players
+
+    def player_balls(self):
+        """Career balls faced plus bowled per player, for the name search."""
+        return self.query(
+            "SELECT batter AS player, COUNT(*) AS balls FROM deliveries GROUP BY batter"
+            " UNION ALL SELECT bowler, COUNT(*) FROM deliveries GROUP BY bowler"
+        )
+
+    def batting_summary(self, player):
+        """Batting by season, or None if the player never faced a ball."""
+        summary = self.query(
+            "SELECT season, SUM(batsman_runs) AS total_runs, COUNT(*) AS total_balls,"
+            " COUNT(DISTINCT match_id) AS matches"
+            " FROM deliveries WHERE batter = ? GROUP BY season ORDER BY season",
+            (player,),
+        )
+        if summary.empty:
+            return None
+        summary["strike_rate"] = (summary["total_runs"] / summary["total_balls"] * 100).round(2)
+        return summary
+
+    def bowling_summary(self, player):
+        """Wickets by season, or None if the player never bowled."""
+        summary = self.query(
+            f"SELECT season, SUM({_WICKET}) AS wickets"
+            " FROM deliveries WHERE bowler = ? GROUP BY season ORDER BY season",
+            (player,),
+        )
+        if summary.empty:
+            return None
+        return summary[summary["wickets"] > 0].reset_index(drop=True)
+
+    def squad(self, team, season):
+        """Sorted names of everyone who batted or bowled for team in season."""
+        rows = self._conn().execute(
+            "SELECT batter FROM deliveries WHERE season = ? AND batting_team = ?"
+            " UNION SELECT bowler FROM deliveries WHERE season = ? AND bowling_team = ?",
+            (season, team, season, team),
+        ).fetchall()
+        return sorted(row[0] for row in rows if row[0] is not None)
+
+    def matchups(self):
+        """Per batter/bowler totals, like the base "matchups" table."""
+        return self.query(
+            "SELECT batter, bowler, SUM(batsman_runs) AS runs, COUNT(*) AS balls,"
+            f" SUM({_WICKET}) AS dismissals, SUM(total_runs = 0) AS dots,"
+            " SUM(batsman_runs IN (4, 6)) AS boundaries"
+            " FROM deliveries GROUP BY batter, bowler"
+        )
+
+    def leaderboards(self, n=10):
+        death_over = DEATH_OVERS[0]
+        # Ties are broken by name, so the order is deterministic
+        return {
+            "team_wins": self.query(
+                # winner is also "No Result"; only a side of the match counts
+                "SELECT winner AS team, COUNT(*) AS wins FROM matches WHERE winner IN (team1, team2)"
+                " GROUP BY winner ORDER BY wins DESC, team"
+            ),
+            "impactful_players": self.query(
+                "SELECT player_of_match AS player, COUNT(*) AS awards FROM matches"
+                " WHERE player_of_match IS NOT NULL GROUP BY player_of_match ORDER BY awards DESC, player LIMIT ?",
+                (n,),
+            ),
+            "top_batsmen": self.query(
+                "SELECT batter, SUM(batsman_runs) AS batsman_runs FROM deliveries"
+                " GROUP BY batter ORDER BY batsman_runs DESC, batter LIMIT ?",
+                (n,),
+            ),
+            "most_sixes": self.query(
+                "SELECT batter, SUM(batsman_runs = 6) AS sixes FROM deliveries"
+                " GROUP BY batter HAVING sixes > 0 ORDER BY sixes DESC, batter LIMIT ?",
+                (n,),
+            ),
+            "top_partnerships": self.query(
+                "SELECT player_1, player_2, SUM(runs) AS runs, SUM(batsman_runs) AS batsman_runs,"
+                " SUM(balls) AS balls, SUM(partnerships) AS partnerships FROM pairs"
+                " GROUP BY player_1, player_2 ORDER BY runs DESC, player_1, player_2 LIMIT ?",
+                (n,),
+            ),
+            "top_bowlers": self.query(
+                f"SELECT bowler, SUM({_WICKET}) AS wickets FROM deliveries"
+                " GROUP BY bowler HAVING wickets > 0 ORDER BY wickets DESC, bowler LIMIT ?",
+                (n,),
+            ),
+            "top_economy_bowlers": self.query(
+                "SELECT bowler, SUM(total_runs) AS total_runs, COUNT(*) AS total_balls,"
+                " ROUND(SUM(total_runs) / (COUNT(*) / 6.0), 2) AS economy FROM deliveries"
+                " GROUP BY bowler HAVING total_balls >= 300 ORDER BY economy, bowler LIMIT ?",
+                (n,),
+            ),
+            "death_bowlers": self.query(
+                "SELECT bowler, SUM(is_wicket) AS wickets FROM deliveries WHERE over >= ?"
+                " GROUP BY bowler HAVING wickets > 0 ORDER BY wickets DESC, bowler LIMIT ?",
+                (death_over, n),
+            ),
+        }
+
+
+if __name__ == "__main__":
+    backend = open_sql_backend()
+    print(f"{backend.path} is current ({len(backend.players)} players).")
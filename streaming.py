@@ -0,0 +1,149 @@
+"""Out-of-core aggregation of ball-by-ball files larger than memory.
+
+    python streaming.py --chunksize 500000 --workers 4
+
+The deliveries CSV is read in fixed-size chunks and never loaded whole.
+Each chunk is cut back to its last complete match (the rest is carried into
+the next chunk), so every chunk holds whole matches and its base tables are
+partial aggregates that merge by a grouped sum, exactly like an ingested
+batch. Only matches.csv, one chunk per worker and the merged tables, whose
+size depends on the number of players rather than balls, are in memory.
+
+The result is the same base tables and leaderboards the in-memory path
+computes, keyed by strings and sorted by key.
+"""
+import argparse
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from aggregations import (
+    delivery_aggregates, leaderboards_from_base, match_aggregates, merge_base_aggregates,
+)
+from data_store import (
+    DELIVERIES_CSV, DELIVERIES_DTYPES, MATCHES_CSV, MATCHES_DTYPES, STORE_DIR, file_checksum,
+    prepare_deliveries, prepare_matches, read_typed_csv, season_by_match, source_version, write_aggregates,
+)
+from teams import TEAMS_CSV, display_name_mapping, load_teams
+
+
+CHUNKSIZE = 500_000
+# Partial tables are collapsed into one after this many, bounding memory
+# and the size of each merge
+MERGE_EVERY = 8
+
+
+def match_chunks(deliveries_csv=DELIVERIES_CSV, chunksize=CHUNKSIZE):
+    """Yield raw deliveries chunks of about chunksize rows, each holding whole matches.
+
+    The balls of a match must be contiguous in the file, as they are in the
+    cleaned CSV; a ValueError is raised when a match shows up again later.
+    """
+    dtypes = {column: dtype for column, dtype in DELIVERIES_DTYPES.items() if column != "season"}
+    seen = set()
+    carry = None
+    for chunk in pd.read_csv(deliveries_csv, dtype=dtypes, chunksize=chunksize):
+        if carry is not None:
+            chunk = _concat_chunks(carry, chunk)
+        if chunk.empty:
+            continue
+
+        match_ids = chunk["match_id"].to_numpy()
+        # Rows of the last match may continue in the next chunk
+        is_last = match_ids == match_ids[-1]
+        cut = len(chunk) - int(np.argmin(is_last[::-1])) if not is_last.all() else 0
+        carry = chunk.iloc[cut:]
+        if cut:
+            chunk = chunk.iloc[:cut]
+            _check_contiguous(match_ids[:cut], seen)
+            yield chunk
+
+    if carry is not None and len(carry):
+        _check_contiguous(carry["match_id"].to_numpy(), seen)
+        yield carry
+
+
+def _concat_chunks(first, second):
+    # Categoricals only stay categorical through concat with equal categories
+    first, second = first.copy(), second.copy()
+    for column in second.columns:
+        if isinstance(second[column].dtype, pd.CategoricalDtype):
+            categories = first[column].cat.categories.union(second[column].cat.categories)
+            first[column] = first[column].cat.set_categories(categories)
+            second[column] = second[column].cat.set_categories(categories)
+    return pd.concat([first, second], ignore_index=True)
+
+
+def _check_contiguous(match_ids, seen):
+    starts = match_ids[np.r_[True, match_ids[1:] != match_ids[:-1]]]
+    ids = set(starts.tolist())
+    if len(ids) != len(starts) or not seen.isdisjoint(ids):
+        raise ValueError("Deliveries must be grouped by match to be streamed")
+    seen.update(ids)
+
+
+def _chunk_aggregates(chunk, seasons, team_names):
+    return delivery_aggregates(prepare_deliveries(chunk, seasons, team_names))
+
+
+def stream_base_aggregates(matches_csv=MATCHES_CSV, deliveries_csv=DELIVERIES_CSV, chunksize=CHUNKSIZE, workers=None):
+    """The base aggregates of the two CSVs, computed in bounded memory.
+
+    With workers, chunks are aggregated in a process pool; at most two
+    chunks per worker are in flight at a time.
+    """
+    team_names = display_name_mapping(load_teams())
+    matches = prepare_matches(read_typed_csv(matches_csv, MATCHES_DTYPES), team_names)
+    seasons = season_by_match(matches)
+
+    partials = []
+
+    def add(partial):
+        partials.append(partial)
+        if len(partials) >= MERGE_EVERY:
+            partials[:] = [merge_base_aggregates(*partials)]
+
+    chunks = match_chunks(deliveries_csv, chunksize)
+    if not workers:
+        for chunk in chunks:
+            add(_chunk_aggregates(chunk, seasons, team_names))
+    else:
+        with ProcessPoolExecutor(workers) as pool:
+            in_flight = deque()
+            for chunk in chunks:
+                if len(in_flight) >= 2 * workers:
+                    add(in_flight.popleft().result())
+                in_flight.append(pool.submit(_chunk_aggregates, chunk, seasons, team_names))
+            while in_flight:
+                add(in_flight.popleft().result())
+
+    # Also sorts a single chunk's tables by key, like any merge
+    base = merge_base_aggregates(*partials) if partials else delivery_aggregates(
+        prepare_deliveries(pd.read_csv(deliveries_csv, nrows=0), seasons, team_names)
+    )
+    base.update(match_aggregates(matches))
+    return base
+
+
+def stream_version(matches_csv=MATCHES_CSV, deliveries_csv=DELIVERIES_CSV):
+    # The version a store built from the same files would have
+    sources = {"matches": matches_csv, "deliveries": deliveries_csv, "teams": TEAMS_CSV}
+    return source_version({name: {"sha256": file_checksum(path)} for name, path in sources.items()})
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compute the dashboard aggregates without loading deliveries whole.")
+    parser.add_argument("--matches", default=MATCHES_CSV)
+    parser.add_argument("--deliveries", default=DELIVERIES_CSV)
+    parser.add_argument("--chunksize", type=int, default=CHUNKSIZE)
+    parser.add_argument("--workers", type=int, default=0, help="processes aggregating chunks (0: in this process)")
+    parser.add_argument("--store-dir", default=STORE_DIR, help="where the aggregates are materialized")
+    args = parser.parse_args()
+
+    base = stream_base_aggregates(args.matches, args.deliveries, args.chunksize, args.workers)
+    version = stream_version(args.matches, args.deliveries)
+    write_aggregates("base", base, version, args.store_dir)
+    write_aggregates("leaderboards", leaderboards_from_base(base), version, args.store_dir)
+    print(f"Materialized the base tables and leaderboards for version {version}.")
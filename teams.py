@@ -0,0 +1,49 @@
+"""Team/franchise dimension table (teams.csv).
+
+One row per active spell of a team: its id, the name used in the cleaned
+data, the name shown on the dashboard, other spellings of it in raw data
+(";"-separated), its franchise and the seasons it played (an empty
+last_season means it is still active).
+"""
+import pandas as pd
+
+
+TEAMS_CSV = "teams.csv"
+
+
+def load_teams(path=TEAMS_CSV):
+    teams = pd.read_csv(path, dtype={"team_id": "int16", "first_season": "int16", "last_season": "Int16"})
+    teams["aliases"] = teams["aliases"].fillna("")
+    return teams
+
+
+def display_name_mapping(teams):
+    """Every known spelling of a team (cleaned name or raw alias) -> display name."""
+    mapping = dict(zip(teams["name"], teams["display_name"]))
+    for aliases, display_name in zip(teams["aliases"], teams["display_name"]):
+        for alias in filter(None, aliases.split(";")):
+            mapping.setdefault(alias.strip(), display_name)
+    return mapping
+
+
+def season_ranges(teams):
+    """Display name -> list of (first_season, last_season) spells; last_season is None while active."""
+    ranges = {}
+    for row in teams.itertuples(index=False):
+        last = None if pd.isna(row.last_season) else int(row.last_season)
+        ranges.setdefault(row.display_name, []).append((int(row.first_season), last))
+    return ranges
+
+
+def played_in(ranges, team, season):
+    """Whether team was active in season; teams missing from teams.csv are never ruled out."""
+    if team not in ranges:
+        return True
+    return any(first <= season and (last is None or season <= last) for first, last in ranges.get(team, []))
+
+
+def squad(deliveries, team):
+    """Sorted names of everyone who batted or bowled for team in the given deliveries."""
+    batters = deliveries.loc[deliveries["batting_team"] == team, "batter"].dropna().unique()
+    bowlers = deliveries.loc[deliveries["bowling_team"] == team, "bowler"].dropna().unique()
+    return sorted(set(batters).union(set(bowlers)))